@@ -0,0 +1,236 @@
+import os
+import sys
+import threading
+from typing import Callable, Dict, List, Optional
+
+import pygame
+
+# --- Opt-in allocation tracing ---
+# AllocationTracer counts the surfaces, masks and fonts created while it is
+# installed, with their pixel bytes, per frame and per calling function.
+# Nothing here runs unless a tracer is installed: it swaps pygame's factory
+# functions (pygame.Surface, pygame.transform.*, pygame.mask.from_*,
+# pygame.font.Font, pygame.image.load) for counting wrappers, and uses a
+# profile hook for Surface.copy()/convert()/convert_alpha(), which cannot be
+# wrapped. Restore everything with uninstall().
+
+KINDS = ("surfaces", "masks", "fonts")
+
+_Surface = pygame.Surface
+_Font = pygame.font.Font
+_active: Optional["AllocationTracer"] = None
+
+COPY_METHODS = {"copy", "convert", "convert_alpha"}
+
+
+def _surface_bytes(surface) -> int:
+    return surface.get_width() * surface.get_height() * surface.get_bytesize()
+
+
+def _describe(code) -> str:
+    return "%s:%s" % (os.path.basename(code.co_filename), getattr(code, "co_qualname", code.co_name))
+
+
+def _caller(depth: int) -> str:
+    return _describe(sys._getframe(depth + 1).f_code)
+
+
+class _SurfaceType(type):
+    # Keeps isinstance(x, pygame.Surface) true for surfaces that were not
+    # created through TracedSurface while the tracer is installed.
+    def __instancecheck__(cls, obj):
+        return isinstance(obj, _Surface)
+
+    def __subclasscheck__(cls, subclass):
+        return issubclass(subclass, _Surface)
+
+
+class TracedSurface(_Surface, metaclass=_SurfaceType):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if _active is not None:
+            _active.record("surfaces", _surface_bytes(self), _caller(1))
+
+
+class TracedFont(_Font):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if _active is not None:
+            _active.record("fonts", 0, _caller(1))
+
+    def render(self, *args, **kwargs):
+        surface = super().render(*args, **kwargs)
+        if _active is not None:
+            _active.record("surfaces", _surface_bytes(surface), _caller(1))
+        return surface
+
+
+def _wrap(func: Callable) -> Callable:
+    # Counts the Surface or Mask a factory function returns, unless it is one
+    # of the arguments (e.g. transform.scale(..., dest_surface)).
+    def traced(*args, **kwargs):
+        result = func(*args, **kwargs)
+        if _active is None or any(result is arg for arg in args) or any(
+                result is arg for arg in kwargs.values()):
+            return result
+        if isinstance(result, _Surface):
+            _active.record("surfaces", _surface_bytes(result), _caller(1))
+        elif isinstance(result, pygame.mask.Mask):
+            w, h = result.get_size()
+            _active.record("masks", (w * h + 7) // 8, _caller(1))
+        return result
+
+    traced.__wrapped__ = func
+    traced.__name__ = func.__name__
+    return traced
+
+
+class AllocationBudgetError(RuntimeError):
+    pass
+
+
+class AllocationTracer:
+    # budget_bytes/budget_count limit what one frame may allocate. Frames
+    # over budget are counted for the report; with strict=True the first one
+    # raises AllocationBudgetError instead. Frames in which a scene was
+    # entered are exempt (see exempt()), since building a scene is expected
+    # to allocate.
+
+    def __init__(self, budget_bytes: Optional[int] = None, budget_count: Optional[int] = None,
+                 strict: bool = False):
+        self.budget_bytes = budget_bytes
+        self.budget_count = budget_count
+        self.strict = strict
+        self.lock = threading.Lock()
+        self.patched: List[tuple] = []
+        self.frames = 0
+        self.exempt_frame = False
+        # current frame, previous frame (the live counter) and run totals
+        self.frame: Dict[str, int] = dict.fromkeys(KINDS + ("bytes",), 0)
+        self.last: Dict[str, int] = dict(self.frame)
+        self.totals: Dict[str, int] = dict(self.frame)
+        self.peak: Dict[str, int] = dict(self.frame)
+        self.frame_callers: Dict[str, int] = {}
+        # caller -> [surfaces, masks, fonts, bytes]
+        self.callers: Dict[str, List[int]] = {}
+        self.over_budget: List[tuple] = []
+
+    # installation
+    def install(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("an AllocationTracer is already installed")
+        _active = self
+        self._patch(pygame, "Surface", TracedSurface)
+        self._patch(pygame.font, "Font", TracedFont)
+        self._patch(pygame.image, "load", _wrap(pygame.image.load))
+        self._patch(pygame.mask, "from_surface", _wrap(pygame.mask.from_surface))
+        self._patch(pygame.mask, "from_threshold", _wrap(pygame.mask.from_threshold))
+        for name in dir(pygame.transform):
+            func = getattr(pygame.transform, name)
+            if not name.startswith("_") and callable(func) and "smoothscale_backend" not in name:
+                self._patch(pygame.transform, name, _wrap(func))
+        sys.setprofile(self._profile)
+        return self
+
+    def uninstall(self):
+        global _active
+        sys.setprofile(None)
+        for module, name, original in reversed(self.patched):
+            setattr(module, name, original)
+        self.patched.clear()
+        _active = None
+
+    def _patch(self, module, name: str, replacement):
+        self.patched.append((module, name, getattr(module, name)))
+        setattr(module, name, replacement)
+
+    def _profile(self, frame, event, arg):
+        if event == "c_call" and getattr(arg, "__name__", None) in COPY_METHODS:
+            surface = getattr(arg, "__self__", None)
+            if isinstance(surface, _Surface):
+                self.record("surfaces", _surface_bytes(surface), _describe(frame.f_code))
+
+    # counting
+    def record(self, kind: str, nbytes: int, caller: str):
+        with self.lock:
+            self.frame[kind] += 1
+            self.frame["bytes"] += nbytes
+            self.frame_callers[caller] = self.frame_callers.get(caller, 0) + nbytes
+            stats = self.callers.get(caller)
+            if stats is None:
+                stats = self.callers[caller] = [0, 0, 0, 0]
+            stats[KINDS.index(kind)] += 1
+            stats[3] += nbytes
+
+    def exempt(self):
+        # The current frame does not count against the budget.
+        self.exempt_frame = True
+
+    def count(self, stats: Dict[str, int]) -> int:
+        return sum(stats[kind] for kind in KINDS)
+
+    def end_frame(self) -> Dict[str, int]:
+        with self.lock:
+            frame, callers = self.frame, self.frame_callers
+            self.frame = dict.fromkeys(frame, 0)
+            self.frame_callers = {}
+        self.frames += 1
+        self.last = frame
+        for key, value in frame.items():
+            self.totals[key] += value
+            self.peak[key] = max(self.peak[key], value)
+
+        exempt, self.exempt_frame = self.exempt_frame, False
+        over = ((self.budget_bytes is not None and frame["bytes"] > self.budget_bytes) or
+                (self.budget_count is not None and self.count(frame) > self.budget_count))
+        if over and not exempt:
+            top = sorted(callers.items(), key=lambda item: -item[1])[:3]
+            self.over_budget.append((self.frames, dict(frame), top))
+            if self.strict:
+                raise AllocationBudgetError("frame %d allocated %d objects, %d bytes (top: %s)" % (
+                    self.frames, self.count(frame), frame["bytes"],
+                    ", ".join("%s %d B" % item for item in top)))
+        return frame
+
+    # reporting
+    def report(self, top: int = 15) -> str:
+        frames = max(1, self.frames)
+        lines = ["allocations over %d frames: %d surfaces, %d masks, %d fonts, %.1f KB" % (
+            self.frames, self.totals["surfaces"], self.totals["masks"], self.totals["fonts"],
+            self.totals["bytes"] / 1024)]
+        lines.append("per frame: %.1f objects, %.1f KB average; %d objects, %.1f KB peak" % (
+            self.count(self.totals) / frames, self.totals["bytes"] / 1024 / frames,
+            self.count(self.peak), self.peak["bytes"] / 1024))
+        if self.budget_bytes is not None or self.budget_count is not None:
+            lines.append("frames over budget: %d" % len(self.over_budget))
+        lines.append("%-48s %8s %6s %6s %10s" % ("caller", "surfaces", "masks", "fonts", "KB"))
+        ranked = sorted(self.callers.items(), key=lambda item: -item[1][3])
+        for caller, (surfaces, masks, fonts, nbytes) in ranked[:top]:
+            lines.append("%-48s %8d %6d %6d %10.1f" % (caller, surfaces, masks, fonts, nbytes / 1024))
+        return "\n".join(lines)
+
+    def print_report(self):
+        print(self.report())
+
+
+def allocation_counter(tracer: Optional[AllocationTracer]) -> str:
+    # Live HUD text for the previous frame, e.g. "ALLOC 3 12.5K".
+    if tracer is None:
+        return ""
+    return "ALLOC %d %.1fK" % (tracer.count(tracer.last), tracer.last["bytes"] / 1024)
+
+
+def tracer_from_env() -> Optional[AllocationTracer]:
+    # TRACE_ALLOCATIONS=1 installs a tracer; ALLOCATION_BUDGET_KB and
+    # ALLOCATION_BUDGET_COUNT set the per-frame budget, and
+    # ALLOCATION_BUDGET_STRICT=1 makes exceeding it an error.
+    if os.environ.get("TRACE_ALLOCATIONS", "") != "1":
+        return None
+    budget_kb = os.environ.get("ALLOCATION_BUDGET_KB")
+    budget_count = os.environ.get("ALLOCATION_BUDGET_COUNT")
+    return AllocationTracer(
+        budget_bytes=int(float(budget_kb) * 1024) if budget_kb else None,
+        budget_count=int(budget_count) if budget_count else None,
+        strict=os.environ.get("ALLOCATION_BUDGET_STRICT", "") == "1",
+    ).install()
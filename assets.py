@@ -0,0 +1,111 @@
+import os
+import queue
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pygame
+
+# --- Shared image cache (keyed by normalized path and alpha mode) ---
+IMAGE_CACHE: Dict[Tuple[str, bool], pygame.Surface] = {}
+
+
+def _key(path: str, alpha: bool) -> Tuple[str, bool]:
+    return os.path.normpath(path), alpha
+
+
+def convert(image: pygame.Surface, alpha: bool = True) -> pygame.Surface:
+    # convert()/convert_alpha() need a display mode; the texture backend has
+    # a renderer window instead, so convert to a plain 32-bit format there.
+    if pygame.display.get_surface() is None:
+        return image.convert(pygame.Surface((1, 1), pygame.SRCALPHA if alpha else 0, 32))
+    return image.convert_alpha() if alpha else image.convert()
+
+
+def get_image(path: str, alpha: bool = True) -> pygame.Surface:
+    # Returns the display-format surface for path, loading it on first use.
+    key = _key(path, alpha)
+    image = IMAGE_CACHE.get(key)
+    if image is None:
+        image = convert(pygame.image.load(path), alpha)
+        IMAGE_CACHE[key] = image
+    return image
+
+
+def list_files(*parts: str) -> List[str]:
+    path = os.path.join(*parts)
+    try:
+        names = sorted(os.listdir(path))
+    except OSError:
+        return []
+    return [os.path.join(path, n) for n in names if os.path.isfile(os.path.join(path, n))]
+
+
+# --- Background preloader ---
+class AssetPreloader:
+    # Decodes image files on a worker thread; conversion to the display
+    # format happens on the main thread in pump()/wait(), since SDL
+    # display state must not be touched from other threads.
+
+    def __init__(self, paths: Iterable[str], alpha: bool = True):
+        self.paths = [p for p in paths if _key(p, alpha) not in IMAGE_CACHE]
+        self.alpha = alpha
+        self.loaded = 0
+        self.failed: List[str] = []
+        self._queue: "queue.Queue[Tuple[str, Optional[pygame.Surface]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def total(self) -> int:
+        return len(self.paths)
+
+    @property
+    def progress(self) -> float:
+        if not self.paths:
+            return 1.0
+        return (self.loaded + len(self.failed)) / len(self.paths)
+
+    @property
+    def done(self) -> bool:
+        return self.loaded + len(self.failed) >= len(self.paths)
+
+    def start(self):
+        if self._thread is not None or not self.paths:
+            return
+        self._thread = threading.Thread(target=self._worker, name="asset-preloader", daemon=True)
+        self._thread.start()
+
+    def _worker(self):
+        for path in self.paths:
+            try:
+                image = pygame.image.load(path)
+            except (pygame.error, OSError):
+                image = None
+            self._queue.put((path, image))
+
+    def _accept(self, path: str, image: Optional[pygame.Surface]):
+        if image is None:
+            self.failed.append(path)
+            return
+        key = _key(path, self.alpha)
+        if key not in IMAGE_CACHE:
+            IMAGE_CACHE[key] = convert(image, self.alpha)
+        self.loaded += 1
+
+    def pump(self, max_items: Optional[int] = None) -> float:
+        # Converts whatever the worker has decoded so far; call once per frame.
+        handled = 0
+        while max_items is None or handled < max_items:
+            try:
+                path, image = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            self._accept(path, image)
+            handled += 1
+        return self.progress
+
+    def wait(self):
+        # Blocks until every asset is decoded and converted.
+        self.start()
+        while not self.done:
+            path, image = self._queue.get()
+            self._accept(path, image)
@@ -0,0 +1,95 @@
+"""Startup benchmark: import cost of game.py and time to the first menu frame.
+
+Each measurement runs in a fresh interpreter so module caches do not leak
+between runs. "eager" replays what importing game.py used to do before the
+menu starts (pygame.init(), open the 1000x700 game window, load every
+MaskDude sheet), then empties the image and sprite caches so the menu's
+preloader and window setup redo their work exactly as in the lazy case. The
+difference is the cost the lazy import now defers until Play. Both are timed
+from after `import pygame`, which they share.
+
+    python bench_startup.py [runs]
+
+Run it from the folder that holds the assets/ directory.
+"""
+import os
+import statistics
+import subprocess
+import sys
+from typing import List
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+IMPORT_GAME = """
+import time
+import pygame
+t = time.perf_counter()
+import game
+print(time.perf_counter() - t)
+"""
+
+FIRST_FRAME = """
+import time
+import pygame
+t = time.perf_counter()
+
+def first_frame():
+    print(time.perf_counter() - t)
+    raise SystemExit
+
+pygame.display.flip = first_frame
+if EAGER:
+    # the old module-level setup; menu.main() still opens its own window
+    pygame.init()
+    pygame.display.set_caption("Platformer")
+    pygame.display.set_mode((1000, 700))
+import game
+if EAGER:
+    import assets
+    try:
+        game.load_sprite_sheets("MainCharacters", "MaskDude", 32, 32, True)
+    except OSError:
+        pass
+    # nothing the replay loaded may be reused by the menu or the preloader
+    assets.IMAGE_CACHE.clear()
+    for cached in (game.load_sprite_sheets, game.load_sprite_masks, game.load_sprite_bounds,
+                   game.load_sprite_sheet_names, game.get_block):
+        cached.cache_clear()
+import menu
+menu.main()
+"""
+
+
+def run(code: str) -> float:
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [HERE, env.get("PYTHONPATH")]))
+    out = subprocess.run([sys.executable, "-c", code], env=env,
+                         capture_output=True, text=True, check=True).stdout
+    return float(out.strip().splitlines()[-1])
+
+
+def measure(*codes: str, runs: int) -> List[float]:
+    # Runs the cases interleaved so drift in machine load hits them alike.
+    samples: List[List[float]] = [[] for _ in codes]
+    for _ in range(runs):
+        for code, case in zip(codes, samples):
+            case.append(run(code))
+    return [statistics.median(case) for case in samples]
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    import_game, eager, lazy = measure(IMPORT_GAME, "EAGER = True\n" + FIRST_FRAME,
+                                       "EAGER = False\n" + FIRST_FRAME, runs=runs)
+    print(f"import game:                 {import_game * 1000:8.1f} ms")
+    print(f"first menu frame (eager):    {eager * 1000:8.1f} ms")
+    print(f"first menu frame (lazy):     {lazy * 1000:8.1f} ms")
+    if lazy > 0:
+        print(f"speedup:                     {eager / lazy:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+from functools import lru_cache
+
+import pygame
+
+from assets import convert, get_image
+
+# --- Default font sheet ---
+BITMAP_FONT_FILE = "assets/Menu/Text/Text_Font.png"
+
+# measured grid values (from detector)
+GLYPH_W = 6
+GLYPH_H = 8
+COLS = 10
+ROWS = 5
+MARGIN_X = 1
+MARGIN_Y = 1
+SPACING_X = 2
+SPACING_Y = 2
+
+CHARS_ORDER = (
+    "ABCDEFGHIJ"
+    "KLMNOPQRST"
+    "UVWXYZ    "  # four empty cells on the sheet
+    "0123456789"
+    ".,:?!()+-"
+)
+
+# --- Pixel-perfect BitmapFont class (menu title, labels and HUD) ---
+class BitmapFont:
+    def __init__(self, sheet: pygame.Surface, chars: str,
+                 glyph_w: int, glyph_h: int,
+                 cols: int, rows: int,
+                 margin_x: int = 0, margin_y: int = 0,
+                 spacing_x: int = 0, spacing_y: int = 0,
+                 alpha_threshold: int = 128, padding: int = 0):
+        self.sheet = convert(sheet)
+        self.chars = chars
+        self.glyph_w = glyph_w
+        self.glyph_h = glyph_h
+        self.cols = cols
+        self.rows = rows
+        self.margin_x = margin_x
+        self.margin_y = margin_y
+        self.spacing_x = spacing_x
+        self.spacing_y = spacing_y
+        self.alpha_threshold = max(0, min(255, alpha_threshold))
+        self.padding = max(0, padding)
+        self.glyphs = {}
+        self._slice_glyphs()
+
+    def _binarize_alpha(self, surf: pygame.Surface) -> pygame.Surface:
+        w, h = surf.get_size()
+        dst = pygame.Surface((w, h), pygame.SRCALPHA)
+        for y in range(h):
+            for x in range(w):
+                r, g, b, a = surf.get_at((x, y))
+                a2 = 255 if a >= self.alpha_threshold else 0
+                dst.set_at((x, y), (r, g, b, a2))
+        return dst
+
+    def _slice_glyphs(self):
+        idx = 0
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if idx >= len(self.chars):
+                    return
+                x = self.margin_x + c * (self.glyph_w + self.spacing_x) - self.padding
+                y = self.margin_y + r * (self.glyph_h + self.spacing_y) - self.padding
+                w = self.glyph_w + 2 * self.padding
+                h = self.glyph_h + 2 * self.padding
+                x = max(0, x)
+                y = max(0, y)
+                if x + w > self.sheet.get_width():
+                    w = self.sheet.get_width() - x
+                if y + h > self.sheet.get_height():
+                    h = self.sheet.get_height() - y
+                rect = pygame.Rect(x, y, w, h)
+                glyph = pygame.Surface((w, h), pygame.SRCALPHA)
+                glyph.blit(self.sheet, (0, 0), rect)
+                glyph = self._binarize_alpha(glyph)
+                self.glyphs[self.chars[idx]] = glyph
+                idx += 1
+
+    def render(self, text: str, scale: float = 1.0, letter_spacing: int = 0) -> pygame.Surface:
+        text = text.upper()
+        int_scale = max(1, int(round(scale)))
+        gw = self.glyph_w * int_scale
+        gh = self.glyph_h * int_scale
+        spacing = letter_spacing * int_scale
+
+        width = sum(gw + spacing for _ in text)
+        if width <= 0:
+            width = 1
+        surf = pygame.Surface((width, gh), pygame.SRCALPHA)
+        x = 0
+        for ch in text:
+            glyph = self.glyphs.get(ch)
+            if glyph is None:
+                glyph = pygame.Surface((self.glyph_w, self.glyph_h), pygame.SRCALPHA)
+            g = pygame.transform.scale(glyph, (gw, gh))
+            surf.blit(g, (x, 0))
+            x += gw + spacing
+        return surf
+
+
+@lru_cache(maxsize=None)
+def load_bitmap_font(path: str = BITMAP_FONT_FILE) -> "BitmapFont":
+    # Shared by the menu title and the HUD; slicing the sheet is not free.
+    return BitmapFont(get_image(path), CHARS_ORDER, GLYPH_W, GLYPH_H,
+                      COLS, ROWS, MARGIN_X, MARGIN_Y, SPACING_X, SPACING_Y,
+                      alpha_threshold=128, padding=0)
@@ -2,23 +2,49 @@ import os
 import random
 import math
 import pygame
+import struct
+from array import array
+from functools import lru_cache
 from os import listdir
 from os.path import isfile, join
-pygame.init()
-
-pygame.display.set_caption("Platformer")
+from allocations import allocation_counter, tracer_from_env
+from assets import get_image, list_files
+from bitmap_font import load_bitmap_font
+from hud import HudLayer
+from parallax import ParallaxBackground
+from render import as_canvas
+from scenes import Scene, SceneManager
+
+try:
+    import numpy as np
+except ImportError:  # batched updates fall back to plain Python loops
+    np = None
+
+# Importing this module must stay free of side effects: the menu imports it
+# before its own window exists. The display and every sprite are created on
+# first use instead.
 
 WIDTH, HEIGHT = 1000, 700
 FPS = 60
 PLAYER_VEL = 5
+# Internal resolution divisor for the standalone game (2 renders at 500x350)
+RENDER_DIVISOR = int(os.environ.get("GAME_RENDER_DIVISOR", "1"))
+
 
-window = pygame.display.set_mode((WIDTH, HEIGHT))
+def get_window():
+    window = pygame.display.get_surface()
+    if window is None:
+        pygame.init()
+        pygame.display.set_caption("Platformer")
+        window = pygame.display.set_mode((WIDTH, HEIGHT))
+    return window
 
 
 def flip(sprites):
     return [pygame.transform.flip(sprite, True, False) for sprite in sprites]
 
 
+@lru_cache(maxsize=None)
 def load_sprite_sheets(dir1, dir2, width, height, direction=False):
     path = join("assets", dir1, dir2)
     images = [f for f in listdir(path) if isfile(join(path, f))]
@@ -26,7 +52,7 @@ def load_sprite_sheets(dir1, dir2, width, height, direction=False):
     all_sprites = {}
 
     for image in images:
-        sprite_sheet = pygame.image.load(join(path, image)).convert_alpha()
+        sprite_sheet = get_image(join(path, image))
 
         sprites = []
         for i in range(sprite_sheet.get_width() // width):
@@ -44,20 +70,76 @@ def load_sprite_sheets(dir1, dir2, width, height, direction=False):
     return all_sprites
 
 
+@lru_cache(maxsize=None)
+def load_sprite_masks(dir1, dir2, width, height, direction=False):
+    sheets = load_sprite_sheets(dir1, dir2, width, height, direction)
+    return {name: [pygame.mask.from_surface(sprite) for sprite in sprites]
+            for name, sprites in sheets.items()}
+
+
+@lru_cache(maxsize=None)
+def load_sprite_bounds(dir1, dir2, width, height, direction=False):
+    # Tight bounding rect of the opaque pixels of every frame.
+    masks = load_sprite_masks(dir1, dir2, width, height, direction)
+    bounds = {}
+    for name, frames in masks.items():
+        bounds[name] = []
+        for mask in frames:
+            rects = mask.get_bounding_rects()
+            bounds[name].append(rects[0].unionall(rects[1:]) if rects else pygame.Rect(0, 0, 0, 0))
+    return bounds
+
+
+@lru_cache(maxsize=None)
+def load_sprite_sheet_names(dir1, dir2, width, height, direction=False):
+    # Fixed order of the sheets, so snapshots can store a sheet as an index.
+    return tuple(load_sprite_sheets(dir1, dir2, width, height, direction))
+
+
+@lru_cache(maxsize=None)
 def get_block(size):
     path = join("assets", "Terrain", "Terrain.png")
-    image = pygame.image.load(path).convert_alpha()
+    image = get_image(path)
     surface = pygame.Surface((size, size), pygame.SRCALPHA, 32)
     rect = pygame.Rect(96, 0, size, size)
     surface.blit(image, (0, 0), rect)
     return pygame.transform.scale2x(surface)
 
 
+def asset_paths():
+    # Every image main() needs, in the order it needs them (for AssetPreloader).
+    return [*list_files("assets", "MainCharacters", "MaskDude"),
+            *list_files("assets", "Traps", "Fire"),
+            join("assets", "Terrain", "Terrain.png"),
+            join("assets", "Background", "Blue.png")]
+
+
+class LazySpriteSheets:
+    # Class attribute that calls load_sprite_sheets (or loader) on first access.
+    def __init__(self, *args, loader=load_sprite_sheets):
+        self.args = args
+        self.loader = loader
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, owner):
+        sprites = self.loader(*self.args)
+        setattr(owner, self.name, sprites)
+        return sprites
+
+
 class Player(pygame.sprite.Sprite):
     COLOR = (255, 0, 0)
     GRAVITY = 1
-    SPRITES = load_sprite_sheets("MainCharacters", "MaskDude", 32, 32, True)
+    SPRITES = LazySpriteSheets("MainCharacters", "MaskDude", 32, 32, True)
+    MASKS = LazySpriteSheets("MainCharacters", "MaskDude", 32, 32, True, loader=load_sprite_masks)
+    BOUNDS = LazySpriteSheets("MainCharacters", "MaskDude", 32, 32, True, loader=load_sprite_bounds)
+    SHEET_NAMES = LazySpriteSheets("MainCharacters", "MaskDude", 32, 32, True, loader=load_sprite_sheet_names)
     ANIMATION_DELAY = 3
+    # x, y, w, h, x_vel, y_vel, animation_count, fall_count, jump_count,
+    # hit_count, sprite sheet, sprite index, facing right, hit
+    STATE = struct.Struct("<5id6i2?")
 
     def __init__(self, x, y, width, height):
         super().__init__()
@@ -139,18 +221,48 @@ class Player(pygame.sprite.Sprite):
         sprite_index = (self.animation_count //
                         self.ANIMATION_DELAY) % len(sprites)
         self.sprite = sprites[sprite_index]
+        self.sprite_sheet_name = sprite_sheet_name
+        self.sprite_index = sprite_index
         self.animation_count += 1
         self.update()
 
     def update(self):
         self.rect = self.sprite.get_rect(topleft=(self.rect.x, self.rect.y))
-        self.mask = pygame.mask.from_surface(self.sprite)
+        self.mask = self.MASKS[self.sprite_sheet_name][self.sprite_index]
+
+    def hitbox(self, dx=0, dy=0):
+        # Bounding rect of the current frame's opaque pixels, optionally offset.
+        bounds = self.BOUNDS[self.sprite_sheet_name][self.sprite_index]
+        return bounds.move(self.rect.x + dx, self.rect.y + dy)
 
     def draw(self, win, offset_x):
         win.blit(self.sprite, (self.rect.x - offset_x, self.rect.y))
 
+    # snapshot support (see WorldState)
+    def state_size(self):
+        return self.STATE.size
+
+    def pack_into(self, buffer, offset):
+        self.STATE.pack_into(buffer, offset, *self.rect, self.x_vel, self.y_vel,
+                             self.animation_count, self.fall_count, self.jump_count, self.hit_count,
+                             self.SHEET_NAMES.index(self.sprite_sheet_name), self.sprite_index,
+                             self.direction == "right", self.hit)
+
+    def unpack_from(self, buffer, offset):
+        (x, y, width, height, self.x_vel, self.y_vel,
+         self.animation_count, self.fall_count, self.jump_count, self.hit_count,
+         sheet, self.sprite_index, right, self.hit) = self.STATE.unpack_from(buffer, offset)
+        self.rect = pygame.Rect(x, y, width, height)
+        self.direction = "right" if right else "left"
+        self.sprite_sheet_name = self.SHEET_NAMES[sheet]
+        self.sprite = self.SPRITES[self.sprite_sheet_name][self.sprite_index]
+        self.mask = self.MASKS[self.sprite_sheet_name][self.sprite_index]
+
 
 class Object(pygame.sprite.Sprite):
+    # Fully opaque objects collide as plain rects; the rest use their mask.
+    opaque = False
+
     def __init__(self, x, y, width, height, name=None):
         super().__init__()
         self.rect = pygame.Rect(x, y, width, height)
@@ -169,68 +281,317 @@ class Block(Object):
         block = get_block(size)
         self.image.blit(block, (0, 0))
         self.mask = pygame.mask.from_surface(self.image)
+        self.opaque = self.mask.count() == size * size
+
+
+class AnimatedBatch:
+    # Animation and motion state for every entity of one kind, stored as
+    # parallel arrays so a single update() per frame advances all of them.
+    # Frames and masks are built once per kind; update() only hands each
+    # entity a new image/mask when its frame actually changes.
+
+    # (name, is float); "frame" indexes self.images/self.masks
+    FIELDS = (("x", True), ("y", True), ("x_vel", True), ("y_vel", True),
+              ("animation_count", False), ("animation", False), ("frame", False))
+
+    def __init__(self, sprites, masks, animation_delay, capacity=16):
+        self.animation_delay = animation_delay
+        self.animation_ids = {}
+        self.animation_names = list(sprites)
+        self.images = []
+        self.masks = []
+        offsets = []
+        lengths = []
+        for name, frames in sprites.items():
+            self.animation_ids[name] = len(offsets)
+            offsets.append(len(self.images))
+            lengths.append(len(frames))
+            self.images.extend(frames)
+            self.masks.extend(masks[name])
+
+        self.entities = []
+        self.count = 0
+        self.capacity = 0
+        if np is not None:
+            self.offsets = np.array(offsets, dtype=np.int64)
+            self.lengths = np.array(lengths, dtype=np.int64)
+        else:
+            self.offsets = array("q", offsets)
+            self.lengths = array("q", lengths)
+        self._grow(capacity)
+
+    def _zeros(self, n, float_type=False):
+        if np is not None:
+            return np.zeros(n, dtype=np.float64 if float_type else np.int64)
+        return array("d" if float_type else "q", bytes(8 * n))
+
+    def _grow(self, capacity):
+        for field, float_type in self.FIELDS:
+            new = self._zeros(capacity, float_type)
+            if self.capacity:
+                new[:self.count] = getattr(self, field)[:self.count]
+            setattr(self, field, new)
+        self.capacity = capacity
+
+    def add(self, entity, x, y, animation):
+        if self.count == self.capacity:
+            self._grow(self.capacity * 2)
+        i = self.count
+        anim_id = self.animation_ids[animation]
+        self.x[i] = x
+        self.y[i] = y
+        self.x_vel[i] = 0
+        self.y_vel[i] = 0
+        self.animation_count[i] = 0
+        self.animation[i] = anim_id
+        self.frame[i] = self.offsets[anim_id]
+        self.entities.append(entity)
+        self.count += 1
+        entity.image = self.images[self.frame[i]]
+        entity.mask = self.masks[self.frame[i]]
+        # every frame of a kind has the same size, so this is set only once
+        entity.rect.size = entity.image.get_size()
+        return i
+
+    def set_animation(self, i, animation):
+        self.animation[i] = self.animation_ids[animation]
+
+    def set_velocity(self, i, x_vel, y_vel):
+        self.x_vel[i] = x_vel
+        self.y_vel[i] = y_vel
+
+    def update(self):
+        if self.count == 0:
+            return
+        if np is None:
+            for i in range(self.count):
+                self.update_one(i)
+            return
+
+        n = self.count
+        delay = self.animation_delay
+        count = self.animation_count[:n]
+        anim = self.animation[:n]
+        lengths = self.lengths[anim]
+
+        frame = self.offsets[anim] + (count // delay) % lengths
+        count += 1
+        count[count // delay > lengths] = 0
+
+        changed = np.flatnonzero(frame != self.frame[:n])
+        self.frame[:n] = frame
+
+        x_vel = self.x_vel[:n]
+        y_vel = self.y_vel[:n]
+        self.x[:n] += x_vel
+        self.y[:n] += y_vel
+        moving = np.flatnonzero((x_vel != 0) | (y_vel != 0))
+
+        entities, images, masks = self.entities, self.images, self.masks
+        for i in changed.tolist():
+            f = int(frame[i])
+            entities[i].image = images[f]
+            entities[i].mask = masks[f]
+        for i in moving.tolist():
+            entities[i].rect.topleft = (int(self.x[i]), int(self.y[i]))
+
+    def update_one(self, i):
+        delay = self.animation_delay
+        anim = self.animation[i]
+        length = self.lengths[anim]
+        count = self.animation_count[i]
+
+        frame = self.offsets[anim] + (count // delay) % length
+        count += 1
+        if count // delay > length:
+            count = 0
+        self.animation_count[i] = count
+
+        entity = self.entities[i]
+        if frame != self.frame[i]:
+            self.frame[i] = frame
+            entity.image = self.images[frame]
+            entity.mask = self.masks[frame]
+        if self.x_vel[i] or self.y_vel[i]:
+            self.x[i] += self.x_vel[i]
+            self.y[i] += self.y_vel[i]
+            entity.rect.topleft = (int(self.x[i]), int(self.y[i]))
+
+    # snapshot support (see WorldState): every field of the live entities,
+    # copied as raw bytes; the entity count must not change in between
+    def state_size(self):
+        return 8 * len(self.FIELDS) * self.count
+
+    def pack_into(self, buffer, offset):
+        n = self.count
+        for field, _ in self.FIELDS:
+            data = memoryview(getattr(self, field))[:n]
+            buffer[offset:offset + data.nbytes] = data.cast("B")
+            offset += data.nbytes
+
+    def unpack_from(self, buffer, offset):
+        n = self.count
+        for field, _ in self.FIELDS:
+            data = memoryview(getattr(self, field))
+            data[:n] = memoryview(buffer)[offset:offset + 8 * n].cast(data.format)
+            offset += 8 * n
+        for i, entity in enumerate(self.entities):
+            entity.image = self.images[self.frame[i]]
+            entity.mask = self.masks[self.frame[i]]
+            entity.rect.size = entity.image.get_size()
+            entity.rect.topleft = (int(self.x[i]), int(self.y[i]))
 
 
 class Fire(Object):
     ANIMATION_DELAY = 3
 
-    def __init__(self, x, y, width, height):
+    @classmethod
+    def make_batch(cls, width=16, height=32):
+        return AnimatedBatch(load_sprite_sheets("Traps", "Fire", width, height),
+                             load_sprite_masks("Traps", "Fire", width, height),
+                             cls.ANIMATION_DELAY)
+
+    def __init__(self, x, y, width, height, batch=None):
         super().__init__(x, y, width, height, "fire")
         self.fire = load_sprite_sheets("Traps", "Fire", width, height)
-        self.image = self.fire["off"][0]
-        self.mask = pygame.mask.from_surface(self.image)
-        self.animation_count = 0
-        self.animation_name = "off"
+        self.batch = batch or self.make_batch(width, height)
+        self.index = self.batch.add(self, x, y, "off")
+
+    @property
+    def animation_name(self):
+        return self.batch.animation_names[self.batch.animation[self.index]]
 
     def on(self):
-        self.animation_name = "on"
+        self.batch.set_animation(self.index, "on")
 
     def off(self):
-        self.animation_name = "off"
+        self.batch.set_animation(self.index, "off")
 
     def loop(self):
-        sprites = self.fire[self.animation_name]
-        sprite_index = (self.animation_count //
-                        self.ANIMATION_DELAY) % len(sprites)
-        self.image = sprites[sprite_index]
-        self.animation_count += 1
+        # Advances only this fire; levels with many fires call batch.update().
+        self.batch.update_one(self.index)
+
+
+# --- World snapshots ---
+class WorldState:
+    # The mutable simulation state of a level packed into one fixed-size
+    # record. Parts are objects with state_size()/pack_into()/unpack_from()
+    # (Player, AnimatedBatch, GameScene); surfaces and masks are never copied,
+    # only the numbers that select them. Build a new WorldState after adding
+    # entities to a batch, since the record size follows the entity count.
+    def __init__(self, *parts):
+        self.parts = parts
+        self.size = sum(part.state_size() for part in parts)
+
+    def pack_into(self, buffer, offset=0):
+        for part in self.parts:
+            part.pack_into(buffer, offset)
+            offset += part.state_size()
+
+    def unpack_from(self, buffer, offset=0):
+        for part in self.parts:
+            part.unpack_from(buffer, offset)
+            offset += part.state_size()
+
+    def snapshot(self):
+        buffer = bytearray(self.size)
+        self.pack_into(buffer)
+        return buffer
+
+    def restore(self, snapshot):
+        self.unpack_from(snapshot)
+
+
+class StateRing:
+    # The last `capacity` snapshots of a WorldState in one preallocated
+    # buffer. push() overwrites the oldest snapshot once the ring is full;
+    # pop() restores the newest one and drops it (one step of rewind).
+    def __init__(self, world, capacity):
+        self.world = world
+        self.capacity = capacity
+        self.buffer = bytearray(world.size * capacity)
+        self.head = 0
+        self.count = 0
 
-        self.rect = self.image.get_rect(topleft=(self.rect.x, self.rect.y))
-        self.mask = pygame.mask.from_surface(self.image)
+    def __len__(self):
+        return self.count
 
-        if self.animation_count // self.ANIMATION_DELAY > len(sprites):
-            self.animation_count = 0
+    def push(self):
+        self.world.pack_into(self.buffer, self.head * self.world.size)
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
 
+    def pop(self):
+        if not self.count:
+            return False
+        self.head = (self.head - 1) % self.capacity
+        self.count -= 1
+        self.world.unpack_from(self.buffer, self.head * self.world.size)
+        return True
 
-def get_background(name):
-    image = pygame.image.load(join("assets", "Background", name))
-    _, _, width, height = image.get_rect()
-    tiles = []
+    def clear(self):
+        self.head = 0
+        self.count = 0
 
-    for i in range(WIDTH // width + 1):
-        for j in range(HEIGHT // height + 1):
-            pos = (i * width, j * height)
-            tiles.append(pos)
 
-    return tiles, image
+def get_background(name, speed=0.0):
+    # One tiled layer filling the window; speed > 0 scrolls it with the camera.
+    background = ParallaxBackground((WIDTH, HEIGHT))
+    background.add_layer(get_image(join("assets", "Background", name)), speed=speed, repeat_y=True)
+    return background
 
 
-def draw(window, background, bg_image, player, objects, offset_x):
-    for tile in background:
-        window.blit(bg_image, tile)
+def draw(window, background, player, objects, offset_x):
+    background.draw(window, offset_x)
 
     for obj in objects:
         obj.draw(window, offset_x)
 
     player.draw(window, offset_x)
 
-    pygame.display.update()
+
+def overlaps(player, obj, hitbox, dx=0, dy=0):
+    # hitbox is the swept player hitbox for opaque objects; transparent ones
+    # fall back to a mask test at the player's position moved by (dx, dy).
+    if obj.opaque:
+        return hitbox.colliderect(obj.rect)
+    # the mask decides the bounds, whatever size obj.rect happens to be
+    if not hitbox.colliderect(pygame.Rect(obj.rect.topleft, obj.mask.get_size())):
+        return False
+    offset = (obj.rect.x - player.rect.x - dx, obj.rect.y - player.rect.y - dy)
+    return player.mask.overlap(obj.mask, offset) is not None
+
+
+def ahead(hitbox, dx, dy):
+    # The strip a straight move by dx or dy sweeps in front of hitbox. Unlike
+    # hitbox.union(target) it leaves out the part of the current position the
+    # target does not cover, so a tile the player only touches there does not
+    # block moving away from it.
+    if dx and not dy:
+        left = hitbox.right if dx > 0 else hitbox.left + dx
+        return pygame.Rect(left, hitbox.top, abs(dx), hitbox.height)
+    if dy and not dx:
+        top = hitbox.bottom if dy > 0 else hitbox.top + dy
+        return pygame.Rect(hitbox.left, top, hitbox.width, abs(dy))
+    return hitbox.move(dx, dy)
+
+
+def query(player, objects, dx=0, dy=0):
+    # Objects the player would touch moving by (dx, dy), without moving it.
+    # Opaque objects are tested against the path ahead of the player.
+    target = player.hitbox(dx, dy)
+    swept = target.union(ahead(player.hitbox(), dx, dy))
+    return [obj for obj in objects
+            if overlaps(player, obj, swept if obj.opaque else target, dx, dy)]
 
 
 def handle_vertical_collision(player, objects, dy):
+    # The player has already moved by dy in loop(); sweep back over that path.
     collided_objects = []
+    hitbox = player.hitbox()
+    swept = hitbox.union(hitbox.move(0, -dy))
     for obj in objects:
-        if pygame.sprite.collide_mask(player, obj):
+        if overlaps(player, obj, swept if obj.opaque else hitbox):
             if dy > 0:
                 player.rect.bottom = obj.rect.top
                 player.landed()
@@ -244,17 +605,8 @@ def handle_vertical_collision(player, objects, dy):
 
 
 def collide(player, objects, dx):
-    player.move(dx, 0)
-    player.update()
-    collided_object = None
-    for obj in objects:
-        if pygame.sprite.collide_mask(player, obj):
-            collided_object = obj
-            break
-
-    player.move(-dx, 0)
-    player.update()
-    return collided_object
+    collided = query(player, objects, dx, 0)
+    return collided[0] if collided else None
 
 
 def handle_move(player, objects):
@@ -277,48 +629,158 @@ def handle_move(player, objects):
             player.make_hit()
 
 
-def main(window):
-    clock = pygame.time.Clock()
-    background, bg_image = get_background("Blue.png")
+class GameScene(Scene):
+    BLOCK_SIZE = 96
+    SCROLL_AREA_WIDTH = 200
+    BACKGROUND_SPEED = 0.25
+    REWIND_SECONDS = 5
+    # offset_x, elapsed
+    STATE = struct.Struct("<id")
 
-    block_size = 96
+    def __init__(self):
+        super().__init__()
+        self.pause_scene = PauseScene(self)
+
+    def enter(self):
+        # Rebuilding the level is cheap: every image comes from the shared
+        # cache and sprite frames are memoized by load_sprite_sheets/get_block.
+        self.background = get_background("Blue.png", self.BACKGROUND_SPEED)
+
+        block_size = self.BLOCK_SIZE
+
+        self.player = Player(100, 100, 50, 50)
+        self.fires = Fire.make_batch(16, 32)
+        self.fire = Fire(100, HEIGHT - block_size - 64, 16, 32, batch=self.fires)
+        self.fire.on()
+        floor = [Block(i * block_size, HEIGHT - block_size, block_size)
+                 for i in range(-WIDTH // block_size, (WIDTH * 2) // block_size)]
+        self.objects = [*floor, Block(0, HEIGHT - block_size * 2, block_size),
+                        Block(block_size * 3, HEIGHT - block_size * 4, block_size), self.fire]
+
+        self.offset_x = 0
+
+        # HUD: level timer plus an FPS counter toggled with F3
+        self.elapsed = 0.0
+        self.hud = HudLayer(load_bitmap_font(), (WIDTH - 20, 52), pos=(10, 10))
+        self.hud_time = self.hud.text(0, 0, 10)
+        self.hud_fps = self.hud.text(WIDTH - 20 - 7 * self.hud.atlas.advance, 0, 7, align="right")
+        self.hud_alloc = self.hud.text(WIDTH - 20 - 16 * self.hud.atlas.advance, 28, 16, align="right")
+        self.show_fps = False
+
+        # Backspace rewinds through the last REWIND_SECONDS of frames; R or
+        # falling off the level restores the state after the first frame.
+        self.world = WorldState(self, self.player, self.fires)
+        self.history = StateRing(self.world, FPS * self.REWIND_SECONDS)
+        self.checkpoint = None
+
+    def respawn(self):
+        self.world.restore(self.checkpoint)
+        self.history.clear()
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key == pygame.K_SPACE and self.player.jump_count < 2:
+                self.player.jump()
+            elif event.key == pygame.K_ESCAPE:
+                self.manager.push(self.pause_scene)
+            elif event.key == pygame.K_F3:
+                self.show_fps = not self.show_fps
+            elif event.key == pygame.K_r and self.checkpoint is not None:
+                self.respawn()
+
+    def update(self, dt):
+        if self.checkpoint is not None and pygame.key.get_pressed()[pygame.K_BACKSPACE]:
+            # one frame back per update; holds on the oldest state once the
+            # history is used up
+            self.history.pop()
+        else:
+            if self.checkpoint is not None:
+                self.history.push()
+            self.step(dt)
+            if self.checkpoint is None:
+                self.checkpoint = self.world.snapshot()
+            elif self.player.rect.top > HEIGHT * 2:
+                self.respawn()
+
+        self.hud_time.set("TIME %5.1f" % self.elapsed)
+        self.hud_fps.set("FPS %d" % self.manager.clock.get_fps() if self.show_fps else "")
+        self.hud_alloc.set(allocation_counter(self.manager.allocations) if self.show_fps else "")
+
+    def step(self, dt):
+        player = self.player
+        player.loop(FPS)
+        self.fires.update()
+        handle_move(player, self.objects)
 
-    player = Player(100, 100, 50, 50)
-    fire = Fire(100, HEIGHT - block_size - 64, 16, 32)
-    fire.on()
-    floor = [Block(i * block_size, HEIGHT - block_size, block_size)
-             for i in range(-WIDTH // block_size, (WIDTH * 2) // block_size)]
-    objects = [*floor, Block(0, HEIGHT - block_size * 2, block_size),
-               Block(block_size * 3, HEIGHT - block_size * 4, block_size), fire]
+        scroll_area_width = self.SCROLL_AREA_WIDTH
+        if ((player.rect.right - self.offset_x >= WIDTH - scroll_area_width) and player.x_vel > 0) or (
+                (player.rect.left - self.offset_x <= scroll_area_width) and player.x_vel < 0):
+            self.offset_x += player.x_vel
 
-    offset_x = 0
-    scroll_area_width = 200
+        self.elapsed += dt
 
-    run = True
-    while run:
-        clock.tick(FPS)
+    # snapshot support (see WorldState)
+    def state_size(self):
+        return self.STATE.size
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                run = False
-                break
+    def pack_into(self, buffer, offset):
+        self.STATE.pack_into(buffer, offset, self.offset_x, self.elapsed)
 
-            if event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE and player.jump_count < 2:
-                    player.jump()
+    def unpack_from(self, buffer, offset):
+        self.offset_x, self.elapsed = self.STATE.unpack_from(buffer, offset)
 
-        player.loop(FPS)
-        fire.loop()
-        handle_move(player, objects)
-        draw(window, background, bg_image, player, objects, offset_x)
+    def draw(self, surface):
+        draw(surface, self.background, self.player, self.objects, self.offset_x)
+        self.hud.draw(surface)
 
-        if ((player.rect.right - offset_x >= WIDTH - scroll_area_width) and player.x_vel > 0) or (
-                (player.rect.left - offset_x <= scroll_area_width) and player.x_vel < 0):
-            offset_x += player.x_vel
+
+class PauseScene(Scene):
+    transparent = True
+
+    def __init__(self, game_scene):
+        super().__init__()
+        self.game_scene = game_scene
+        self.overlay = None
+        self.font = None
+
+    def enter(self):
+        if self.font is None:
+            self.font = pygame.font.Font(None, 48)
+            self.hint_font = pygame.font.Font(None, 24)
+            self.title = self.font.render("PAUSED", True, (255, 255, 255))
+            self.hint = self.hint_font.render("Esc: resume   M: menu", True, (200, 200, 210))
+
+    def handle_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_ESCAPE, pygame.K_p):
+                self.manager.pop()
+            elif event.key in (pygame.K_m, pygame.K_q):
+                # back to whatever was below the game (the menu, if any)
+                self.manager.pop_to(self.game_scene)
+                self.manager.pop()
+
+    def draw(self, surface):
+        if self.overlay is None or self.overlay.get_size() != surface.get_size():
+            self.overlay = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 140))
+        surface.blit(self.overlay, (0, 0))
+        center = surface.get_rect().center
+        surface.blit(self.title, self.title.get_rect(center=center))
+        surface.blit(self.hint, self.hint.get_rect(center=(center[0], center[1] + 40)))
+
+
+def main(window):
+    # Standalone entry point: runs the game as the only scene.
+    allocations = tracer_from_env()
+    manager = SceneManager(window, pygame.time.Clock(), FPS, allocations=allocations)
+    manager.push(GameScene())
+    manager.run()
+    if allocations is not None:
+        allocations.print_report()
 
     pygame.quit()
     quit()
 
 
 if __name__ == "__main__":
-    main(window)
\ No newline at end of file
+    main(as_canvas(get_window(), RENDER_DIVISOR))
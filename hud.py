@@ -0,0 +1,109 @@
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from bitmap_font import BitmapFont
+
+# --- Pre-scaled glyph atlas ---
+class GlyphAtlas:
+    # Every glyph of a BitmapFont scaled once and packed side by side into a
+    # single surface, so HUD text is drawn by copying atlas areas.
+
+    def __init__(self, font: BitmapFont, scale: float = 1.0, letter_spacing: int = 0):
+        int_scale = max(1, int(round(scale)))  # same rounding as BitmapFont.render
+        self.glyph_w = font.glyph_w * int_scale
+        self.glyph_h = font.glyph_h * int_scale
+        self.advance = self.glyph_w + letter_spacing * int_scale
+        self.surface = pygame.Surface((max(1, self.glyph_w * len(font.chars)), self.glyph_h), pygame.SRCALPHA)
+        self.areas: Dict[str, pygame.Rect] = {}
+        for i, ch in enumerate(font.chars):
+            glyph = font.glyphs.get(ch)
+            if glyph is None:
+                continue
+            area = pygame.Rect(i * self.glyph_w, 0, self.glyph_w, self.glyph_h)
+            self.surface.blit(pygame.transform.scale(glyph, area.size), area)
+            self.areas[ch] = area
+
+    def area(self, ch: str) -> Optional[pygame.Rect]:
+        # None for characters the font does not have (drawn as blanks)
+        return self.areas.get(ch) or self.areas.get(ch.upper())
+
+
+# --- Retained HUD text ---
+class HudText:
+    # A fixed-width field on a HudLayer. set() compares the new string with
+    # what is on screen and queues only the cells whose character changed.
+
+    def __init__(self, layer: "HudLayer", x: int, y: int, max_chars: int, align: str = "left"):
+        self.layer = layer
+        self.max_chars = max_chars
+        self.align = align
+        self.text = ""
+        self.shown: List[str] = [" "] * max_chars
+        atlas = layer.atlas
+        self.cells = [pygame.Rect(x + i * atlas.advance, y, atlas.glyph_w, atlas.glyph_h)
+                      for i in range(max_chars)]
+        # per cell: character -> ready-made (atlas, dest, area) blit entry
+        self.blits: List[Dict[str, Tuple]] = [{} for _ in range(max_chars)]
+
+    def set(self, text: str):
+        if text == self.text:
+            return
+        self.text = text
+        text = text[:self.max_chars]
+        pad = self.max_chars - len(text)
+        start = pad if self.align == "right" else 0
+        for i in range(self.max_chars):
+            j = i - start
+            ch = text[j] if 0 <= j < len(text) else " "
+            if ch != self.shown[i]:
+                self.shown[i] = ch
+                self.layer.queue(self.cells[i], self._blit(i, ch))
+
+    def _blit(self, i: int, ch: str) -> Optional[Tuple]:
+        entry = self.blits[i].get(ch)
+        if entry is None:
+            area = self.layer.atlas.area(ch)
+            if area is None:
+                return None
+            entry = self.blits[i][ch] = (self.layer.atlas.surface, self.cells[i], area)
+        return entry
+
+
+class HudLayer:
+    # Owns a transparent surface holding any number of HudText fields. Changed
+    # cells are cleared and redrawn in one Surface.blits call when the layer
+    # is drawn; the layer itself reaches the screen as a single blit.
+
+    def __init__(self, font: BitmapFont, size: Tuple[int, int], pos: Tuple[int, int] = (0, 0),
+                 scale: float = 2.0, letter_spacing: int = 1):
+        self.atlas = GlyphAtlas(font, scale, letter_spacing)
+        self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        self.pos = pos
+        self.visible = True
+        self.pending_clear: List[pygame.Rect] = []
+        self.pending_blits: List[Tuple] = []
+
+    def text(self, x: int, y: int, max_chars: int, align: str = "left") -> HudText:
+        return HudText(self, x, y, max_chars, align)
+
+    def queue(self, cell: pygame.Rect, blit: Optional[Tuple]):
+        self.pending_clear.append(cell)
+        if blit is not None:
+            self.pending_blits.append(blit)
+
+    def flush(self) -> bool:
+        if not self.pending_clear:
+            return False
+        for cell in self.pending_clear:
+            self.surface.fill((0, 0, 0, 0), cell)
+        self.surface.blits(self.pending_blits, doreturn=False)
+        self.pending_clear.clear()
+        self.pending_blits.clear()
+        return True
+
+    def draw(self, canvas):
+        if self.flush():
+            canvas.invalidate(self.surface)
+        if self.visible:
+            canvas.blit(self.surface, self.pos)
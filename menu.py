@@ -1,3 +1,4 @@
+import atexit
 import os
 # center the SDL window on the desktop before initializing pygame
 os.environ.setdefault("SDL_VIDEO_CENTERED", "1")
@@ -5,9 +6,15 @@ os.environ.setdefault("SDL_VIDEO_CENTERED", "1")
 import pygame
 import sys
 import random
-import math
-from typing import List, Tuple, Optional, Callable
+from typing import Dict, List, Tuple, Optional, Callable
 import game  # game.py must be in the same folder
+from allocations import allocation_counter, tracer_from_env
+from assets import AssetPreloader, convert
+from bitmap_font import BITMAP_FONT_FILE, BitmapFont, load_bitmap_font
+from hud import HudLayer
+from parallax import ParallaxBackground
+from render import as_canvas, create_canvas
+from scenes import Scene, SceneManager
 
 pygame.init()
 
@@ -18,6 +25,14 @@ FPS = 60
 BG_COLOR = (18, 18, 30)
 ACCENT = (255, 200, 60)
 
+# Render backend: "surface" (default, CPU compositing onto the display
+# Surface) or "texture" (pygame._sdl2.video renderer). RENDER_SOFTWARE forces
+# SDL's software renderer, which also works headless.
+RENDER_BACKEND = os.environ.get("MENU_RENDER_BACKEND", "surface")
+RENDER_SOFTWARE = os.environ.get("MENU_RENDER_SOFTWARE", "") == "1"
+# Internal resolution divisor: 2 renders at 775x450 and scales up 2x.
+RENDER_DIVISOR = int(os.environ.get("MENU_RENDER_DIVISOR", "1"))
+
 FONT_NAME = None
 FONT_SIZE = 28
 TITLE_FONT_SIZE = 56
@@ -28,11 +43,12 @@ BUTTON_HEIGHT = 72
 BUTTON_PADDING = 56
 
 # Image paths
-BACKGROUND_IMAGE = "assets/Background/jungle.png"
+# (path, speed) per parallax layer, farthest first; each image is fitted to
+# the screen and scrolls at speed * the background scroll speed
+BACKGROUND_LAYERS: List[Tuple[str, float]] = [("assets/Background/jungle.png", 1.0)]
 LOGO_IMAGE = ""
 
-# Bitmap font sheet (for title only)
-BITMAP_FONT_FILE = "assets/Menu/Text/Text_Font.png"
+# Bitmap font sheet (see bitmap_font.py for the glyph grid)
 LETTER_SPACING = 3
 
 # --- Sprite sheet config ---
@@ -70,10 +86,11 @@ QUIT_SCALE_PRESSED = 3
 # Adjustable positioning and spacing
 BUTTON_BLOCK_TOP_OFFSET = 220   # distance from panel top to the first button block (pushes buttons lower from title)
 BUTTON_SPACING = 48             # vertical spacing between buttons (after scaling)
+MENU_VISIBLE_ROWS = 4           # rows shown at once; longer menus scroll
 
 # --- Image loader (nearest-neighbor for pixel art) ---
 def load_image(path: str, size: Optional[Tuple[int, int]] = None) -> pygame.Surface:
-    img = pygame.image.load(path).convert_alpha()
+    img = convert(pygame.image.load(path))
     if size:
         img = pygame.transform.scale(img, size)
     return img
@@ -96,83 +113,6 @@ def blur_surface(surface: pygame.Surface, radius: int) -> pygame.Surface:
         blurred = surface.copy()
     return blurred
 
-# --- Pixel-perfect BitmapFont class (used for title) ---
-class BitmapFont:
-    def __init__(self, sheet: pygame.Surface, chars: str,
-                 glyph_w: int, glyph_h: int,
-                 cols: int, rows: int,
-                 margin_x: int = 0, margin_y: int = 0,
-                 spacing_x: int = 0, spacing_y: int = 0,
-                 alpha_threshold: int = 128, padding: int = 0):
-        self.sheet = sheet.convert_alpha()
-        self.chars = chars
-        self.glyph_w = glyph_w
-        self.glyph_h = glyph_h
-        self.cols = cols
-        self.rows = rows
-        self.margin_x = margin_x
-        self.margin_y = margin_y
-        self.spacing_x = spacing_x
-        self.spacing_y = spacing_y
-        self.alpha_threshold = max(0, min(255, alpha_threshold))
-        self.padding = max(0, padding)
-        self.glyphs = {}
-        self._slice_glyphs()
-
-    def _binarize_alpha(self, surf: pygame.Surface) -> pygame.Surface:
-        w, h = surf.get_size()
-        dst = pygame.Surface((w, h), pygame.SRCALPHA)
-        for y in range(h):
-            for x in range(w):
-                r, g, b, a = surf.get_at((x, y))
-                a2 = 255 if a >= self.alpha_threshold else 0
-                dst.set_at((x, y), (r, g, b, a2))
-        return dst
-
-    def _slice_glyphs(self):
-        idx = 0
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if idx >= len(self.chars):
-                    return
-                x = self.margin_x + c * (self.glyph_w + self.spacing_x) - self.padding
-                y = self.margin_y + r * (self.glyph_h + self.spacing_y) - self.padding
-                w = self.glyph_w + 2 * self.padding
-                h = self.glyph_h + 2 * self.padding
-                x = max(0, x)
-                y = max(0, y)
-                if x + w > self.sheet.get_width():
-                    w = self.sheet.get_width() - x
-                if y + h > self.sheet.get_height():
-                    h = self.sheet.get_height() - y
-                rect = pygame.Rect(x, y, w, h)
-                glyph = pygame.Surface((w, h), pygame.SRCALPHA)
-                glyph.blit(self.sheet, (0, 0), rect)
-                glyph = self._binarize_alpha(glyph)
-                self.glyphs[self.chars[idx]] = glyph
-                idx += 1
-
-    def render(self, text: str, scale: float = 1.0, letter_spacing: int = 0) -> pygame.Surface:
-        text = text.upper()
-        int_scale = max(1, int(round(scale)))
-        gw = self.glyph_w * int_scale
-        gh = self.glyph_h * int_scale
-        spacing = letter_spacing * int_scale
-
-        width = sum(gw + spacing for _ in text)
-        if width <= 0:
-            width = 1
-        surf = pygame.Surface((width, gh), pygame.SRCALPHA)
-        x = 0
-        for ch in text:
-            glyph = self.glyphs.get(ch)
-            if glyph is None:
-                glyph = pygame.Surface((self.glyph_w, self.glyph_h), pygame.SRCALPHA)
-            g = nearest_scale(glyph, (gw, gh))
-            surf.blit(g, (x, 0))
-            x += gw + spacing
-        return surf
-
 # --- Easing helpers ---
 def ease_out_cubic(t: float) -> float:
     return 1 - pow(1 - t, 3)
@@ -218,6 +158,7 @@ class Button:
         self.hovered = False
         self.pressed = False
         self.text_alpha = 255
+        self._label: Optional[pygame.Surface] = None
 
     def current_image_and_scale(self) -> Tuple[Optional[pygame.Surface], int]:
         if self.pressed and self.image_pressed:
@@ -226,15 +167,23 @@ class Button:
             return self.image_hover, self.scale_hover
         return self.image_normal, self.scale_normal
 
-    def draw(self, surf: pygame.Surface, font: pygame.font.Font, bitmap_font: Optional[BitmapFont], font_scale: float):
+    def draw(self, surf, font: pygame.font.Font, bitmap_font: Optional[BitmapFont], font_scale: float):
+        # surf is a render canvas (see render.py)
         img, scale = self.current_image_and_scale()
         if not img:
+            # buttons without sprite frames (e.g. long level lists) show their label
+            if self.text and bitmap_font:
+                if self._label is None:
+                    self._label = bitmap_font.render(self.text, scale=font_scale, letter_spacing=1)
+                if self.hovered or self.pressed:
+                    surf.draw_rect(ACCENT, self.rect, width=2, border_radius=6)
+                surf.blit(self._label, self._label.get_rect(center=self.rect.center))
             return
         eff_w = img.get_width() * scale
         eff_h = img.get_height() * scale
-        scaled = nearest_scale(img, (eff_w, eff_h))
-        img_rect = scaled.get_rect(center=self.rect.center)
-        surf.blit(scaled, img_rect.topleft)
+        img_rect = pygame.Rect(0, 0, eff_w, eff_h)
+        img_rect.center = self.rect.center
+        surf.blit_scaled(img, img_rect)
 
     def update(self, dt: float):
         pass
@@ -248,90 +197,331 @@ class Button:
                 self.action()
             self.pressed = False
 
-# --- Menu runner ---
-def run_menu(screen: pygame.Surface, clock: pygame.time.Clock, title: str, items: List[Tuple[str, Callable]]):
-    font = pygame.font.Font(FONT_NAME, FONT_SIZE)
-
-    # load assets
-    bg_img = None
-    try:
-        bg_img = load_image(BACKGROUND_IMAGE, size=screen.get_size()) if BACKGROUND_IMAGE else None
-    except Exception:
-        bg_img = None
-
-    # Load the sprite sheet for START/QUIT
-    try:
-        sheet_buttons = load_image(SPRITE_SHEET_PATH)
-    except Exception:
-        sheet_buttons = None
-
-    # Slice START frames (grid-based)
-    start_normal = slice_frame_grid(sheet_buttons, START_NORMAL_COL, START_NORMAL_ROW, START_FRAME_W, START_FRAME_H) if sheet_buttons else None
-    start_hover  = slice_frame_grid(sheet_buttons, START_HOVER_COL,  START_HOVER_ROW,  START_FRAME_W, START_FRAME_H) if sheet_buttons else None
-    start_press  = slice_frame_grid(sheet_buttons, START_PRESSED_COL, START_PRESSED_ROW, START_FRAME_W, START_FRAME_H) if sheet_buttons else None
-
-    # Slice QUIT frames (pixel-based if provided, otherwise grid-based)
-    if sheet_buttons and QUIT_NORMAL_PIXEL:
-        qnx, qny = QUIT_NORMAL_PIXEL
-        quit_normal = slice_frame_pixels(sheet_buttons, qnx, qny, QUIT_FRAME_W, QUIT_FRAME_H)
-    else:
-        quit_normal = slice_frame_grid(sheet_buttons, QUIT_NORMAL_COL, QUIT_NORMAL_ROW, QUIT_FRAME_W, QUIT_FRAME_H) if sheet_buttons else None
-
-    if sheet_buttons and QUIT_HOVER_PIXEL:
-        qhx, qhy = QUIT_HOVER_PIXEL
-        quit_hover = slice_frame_pixels(sheet_buttons, qhx, qhy, QUIT_FRAME_W, QUIT_FRAME_H)
-    else:
-        quit_hover = slice_frame_grid(sheet_buttons, QUIT_HOVER_COL, QUIT_HOVER_ROW, QUIT_FRAME_W, QUIT_FRAME_H) if sheet_buttons else None
-
-    if sheet_buttons and QUIT_PRESSED_PIXEL:
-        qpx, qpy = QUIT_PRESSED_PIXEL
-        quit_press = slice_frame_pixels(sheet_buttons, qpx, qpy, QUIT_FRAME_W, QUIT_FRAME_H)
-    else:
-        quit_press = slice_frame_grid(sheet_buttons, QUIT_PRESSED_COL, QUIT_PRESSED_ROW, QUIT_FRAME_W, QUIT_FRAME_H) if sheet_buttons else None
-
-    # quick sanity prints (optional)
-    print("start_normal size:", getattr(start_normal, "get_size", lambda: None)())
-    print("start_hover  size:", getattr(start_hover,  "get_size", lambda: None)())
-    print("quit_normal  size:", getattr(quit_normal,  "get_size", lambda: None)())
-    print("quit_hover   size:", getattr(quit_hover,   "get_size", lambda: None)())
-
-    logo_img = None
-    try:
-        logo_img = load_image(LOGO_IMAGE, size=(300, 120)) if LOGO_IMAGE else None
-    except Exception:
-        logo_img = None
-
-    # button image holder (map keys to images and scales and frame sizes)
-    BUTTON_IMAGE_HOLDER = {
-        "play": {
-            "imgs": (start_normal, start_hover, start_press or start_hover),
-            "scales": (START_SCALE_NORMAL, START_SCALE_HOVER, START_SCALE_PRESSED),
-            "frame_size": (START_FRAME_W, START_FRAME_H)
-        },
-        "exit": {
-            "imgs": (quit_normal, quit_hover, quit_press or quit_hover),
-            "scales": (QUIT_SCALE_NORMAL, QUIT_SCALE_HOVER, QUIT_SCALE_PRESSED),
-            "frame_size": (QUIT_FRAME_W, QUIT_FRAME_H)
-        }
-    }
+# --- Virtualized, scrollable button list ---
+class MenuList:
+    # Only the rows inside the viewport have Button objects; they are created
+    # by make_button(index) when scrolled into view and dropped when scrolled
+    # out. Rows share one pitch, so hit-testing and keyboard moves are index
+    # arithmetic instead of scans over every item.
+
+    def __init__(self, count: int, viewport: pygame.Rect, pitch: int,
+                 make_button: Callable[[int], Button]):
+        self.count = count
+        self.viewport = viewport
+        self.pitch = max(1, pitch)
+        self.make_button = make_button
+        self.scroll = 0
+        self.selected = 0
+        self.pressed_idx: Optional[int] = None
+        self.last_mouse = None
+        self.pool: Dict[int, Button] = {}
+        self._sync()
+
+    @property
+    def max_scroll(self) -> int:
+        return max(0, self.count * self.pitch - self.viewport.h)
+
+    def visible_range(self) -> range:
+        first = self.scroll // self.pitch
+        last = min(self.count, (self.scroll + self.viewport.h + self.pitch - 1) // self.pitch)
+        return range(first, last)
+
+    def visible_buttons(self) -> List[Button]:
+        return [self.pool[i] for i in self.visible_range()]
+
+    def _sync(self):
+        visible = self.visible_range()
+        for i in [i for i in self.pool if i not in visible]:
+            del self.pool[i]
+        for i in visible:
+            b = self.pool.get(i)
+            if b is None:
+                b = self.pool[i] = self.make_button(i)
+                b.hovered = i == self.selected
+            b.rect.center = (self.viewport.centerx,
+                             self.viewport.y + i * self.pitch - self.scroll + self.pitch // 2)
+
+    def index_at(self, pos) -> Optional[int]:
+        if not self.count or not self.viewport.collidepoint(pos):
+            return None
+        i = (pos[1] - self.viewport.y + self.scroll) // self.pitch
+        if i >= self.count or not self.pool[i].rect.collidepoint(pos):
+            return None
+        return i
+
+    def scroll_to(self, scroll: int):
+        scroll = max(0, min(self.max_scroll, scroll))
+        if scroll != self.scroll:
+            self.scroll = scroll
+            self._sync()
+
+    def ensure_visible(self, i: int):
+        top = i * self.pitch
+        if top < self.scroll:
+            self.scroll_to(top)
+        elif top + self.pitch > self.scroll + self.viewport.h:
+            self.scroll_to(top + self.pitch - self.viewport.h)
+
+    def select(self, i: int):
+        if not self.count:
+            return
+        old = self.pool.get(self.selected)
+        if old:
+            old.hovered = False
+        self.selected = i % self.count
+        self.ensure_visible(self.selected)
+        self.pool[self.selected].hovered = True
+
+    def reset(self):
+        for b in self.pool.values():
+            b.pressed = False
+            b.hovered = False
+        self.pressed_idx = None
+        self.select(self.selected)
+
+    def activate(self, i: int):
+        # the row may have been scrolled out of view (and out of the pool)
+        self.ensure_visible(i)
+        b = self.pool.get(i)
+        if b and b.action:
+            b.action()
+
+    def handle_event(self, event: pygame.event.Event):
+        rows = max(1, self.viewport.h // self.pitch)
+        if event.type == pygame.KEYDOWN:
+            if event.key in (pygame.K_DOWN, pygame.K_s):
+                self.select(self.selected + 1)
+            elif event.key in (pygame.K_UP, pygame.K_w):
+                self.select(self.selected - 1)
+            elif event.key == pygame.K_PAGEDOWN:
+                self.select(min(self.count - 1, self.selected + rows))
+            elif event.key == pygame.K_PAGEUP:
+                self.select(max(0, self.selected - rows))
+            elif event.key == pygame.K_HOME:
+                self.select(0)
+            elif event.key == pygame.K_END:
+                self.select(self.count - 1)
+            elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
+                self.activate(self.selected)
+        elif event.type == pygame.MOUSEWHEEL:
+            self.scroll_to(self.scroll - event.y * self.pitch)
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            i = self.index_at(event.pos)
+            if i is not None:
+                self.select(i)
+                self.pool[i].pressed = True
+                self.pressed_idx = i
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            i = self.pressed_idx
+            self.pressed_idx = None
+            b = self.pool.get(i) if i is not None else None
+            if b:
+                b.pressed = False
+                if self.index_at(event.pos) == i:
+                    self.activate(i)
+
+    def update(self, dt: float, mouse_pos):
+        # hover follows the mouse only when it moves, so keyboard scrolling
+        # is not undone by a cursor resting over the list
+        if mouse_pos != self.last_mouse:
+            self.last_mouse = mouse_pos
+            i = self.index_at(mouse_pos)
+            if i is not None and i != self.selected:
+                self.select(i)
+        for i in self.visible_range():
+            self.pool[i].update(dt)
+
+    def draw(self, surf, font: pygame.font.Font, bitmap_font: Optional[BitmapFont], font_scale: float):
+        clip = surf.get_clip()
+        surf.set_clip(self.viewport.clip(clip))
+        for i in self.visible_range():
+            self.pool[i].draw(surf, font, bitmap_font, font_scale)
+        surf.set_clip(clip)
+
+        # scrollbar when the list is longer than the viewport
+        if self.max_scroll:
+            track = pygame.Rect(self.viewport.right + 12, self.viewport.y, 4, self.viewport.h)
+            thumb_h = max(12, track.h * self.viewport.h // (self.count * self.pitch))
+            thumb_y = track.y + (track.h - thumb_h) * self.scroll // self.max_scroll
+            surf.draw_rect((60, 60, 80), track)
+            surf.draw_rect(ACCENT, pygame.Rect(track.x, thumb_y, track.w, thumb_h))
+
+
+# --- Menu scene ---
+class MenuScene(Scene):
+    def __init__(self, title: str, items: List[Tuple[str, Callable]],
+                 preloader: Optional[AssetPreloader] = None):
+        super().__init__()
+        self.title = title
+        self.items = items
+        self.preloader = preloader
+        self.built = False
+
+    def enter(self):
+        # start decoding the game's assets in the background while the menu runs
+        if self.preloader:
+            self.preloader.start()
+        if not self.built:
+            self.build(self.manager.screen)
+            self.built = True
+
+    def resume(self):
+        # coming back from another scene: drop any pressed/expanding state
+        self.expanding = False
+        self.finishing = False
+        self.expand_button = None
+        self.menu_list.reset()
+
+    def build(self, screen: pygame.Surface):
+        items = self.items
+        self.font = pygame.font.Font(FONT_NAME, FONT_SIZE)
+        self.hint_font = pygame.font.Font(FONT_NAME, 16)
+
+        # load assets
+        background = ParallaxBackground(screen.get_size())
+        for path, speed in BACKGROUND_LAYERS:
+            try:
+                background.add_layer(load_image(path, size=screen.get_size()), speed=speed)
+            except Exception:
+                pass
+        self.background = background if background.layers else None
+
+        # Load the sprite sheet for START/QUIT
+        try:
+            sheet_buttons = load_image(SPRITE_SHEET_PATH)
+        except Exception:
+            sheet_buttons = None
+
+        # Slice START frames (grid-based)
+        start_normal = slice_frame_grid(sheet_buttons, START_NORMAL_COL, START_NORMAL_ROW, START_FRAME_W, START_FRAME_H) if sheet_buttons else None
+        start_hover  = slice_frame_grid(sheet_buttons, START_HOVER_COL,  START_HOVER_ROW,  START_FRAME_W, START_FRAME_H) if sheet_buttons else None
+        start_press  = slice_frame_grid(sheet_buttons, START_PRESSED_COL, START_PRESSED_ROW, START_FRAME_W, START_FRAME_H) if sheet_buttons else None
+
+        # Slice QUIT frames (pixel-based if provided, otherwise grid-based)
+        if sheet_buttons and QUIT_NORMAL_PIXEL:
+            qnx, qny = QUIT_NORMAL_PIXEL
+            quit_normal = slice_frame_pixels(sheet_buttons, qnx, qny, QUIT_FRAME_W, QUIT_FRAME_H)
+        else:
+            quit_normal = slice_frame_grid(sheet_buttons, QUIT_NORMAL_COL, QUIT_NORMAL_ROW, QUIT_FRAME_W, QUIT_FRAME_H) if sheet_buttons else None
 
-    # layout: virtual panel_rect for positioning (centered inside the window)
-    panel_w = BUTTON_WIDTH + 120
-    panel_h = (BUTTON_HEIGHT + BUTTON_PADDING) * len(items) + 220
-    panel_rect = pygame.Rect(0, 0, panel_w, panel_h)
-    panel_rect.center = screen.get_rect().center
+        if sheet_buttons and QUIT_HOVER_PIXEL:
+            qhx, qhy = QUIT_HOVER_PIXEL
+            quit_hover = slice_frame_pixels(sheet_buttons, qhx, qhy, QUIT_FRAME_W, QUIT_FRAME_H)
+        else:
+            quit_hover = slice_frame_grid(sheet_buttons, QUIT_HOVER_COL, QUIT_HOVER_ROW, QUIT_FRAME_W, QUIT_FRAME_H) if sheet_buttons else None
 
-    # create buttons
-    buttons: List[Button] = []
+        if sheet_buttons and QUIT_PRESSED_PIXEL:
+            qpx, qpy = QUIT_PRESSED_PIXEL
+            quit_press = slice_frame_pixels(sheet_buttons, qpx, qpy, QUIT_FRAME_W, QUIT_FRAME_H)
+        else:
+            quit_press = slice_frame_grid(sheet_buttons, QUIT_PRESSED_COL, QUIT_PRESSED_ROW, QUIT_FRAME_W, QUIT_FRAME_H) if sheet_buttons else None
 
-    # Title and button block positions
-    title_y = panel_rect.y + 60
-    start_y = panel_rect.y + BUTTON_BLOCK_TOP_OFFSET
+        # quick sanity prints (optional)
+        print("start_normal size:", getattr(start_normal, "get_size", lambda: None)())
+        print("start_hover  size:", getattr(start_hover,  "get_size", lambda: None)())
+        print("quit_normal  size:", getattr(quit_normal,  "get_size", lambda: None)())
+        print("quit_hover   size:", getattr(quit_hover,   "get_size", lambda: None)())
 
-    for i, (label, action) in enumerate(items):
-        bx = panel_rect.centerx
+        logo_img = None
+        try:
+            logo_img = load_image(LOGO_IMAGE, size=(300, 120)) if LOGO_IMAGE else None
+        except Exception:
+            logo_img = None
+        self.logo_img = logo_img
+
+        # button image holder (map keys to images and scales and frame sizes)
+        BUTTON_IMAGE_HOLDER = {
+            "play": {
+                "imgs": (start_normal, start_hover, start_press or start_hover),
+                "scales": (START_SCALE_NORMAL, START_SCALE_HOVER, START_SCALE_PRESSED),
+                "frame_size": (START_FRAME_W, START_FRAME_H)
+            },
+            "exit": {
+                "imgs": (quit_normal, quit_hover, quit_press or quit_hover),
+                "scales": (QUIT_SCALE_NORMAL, QUIT_SCALE_HOVER, QUIT_SCALE_PRESSED),
+                "frame_size": (QUIT_FRAME_W, QUIT_FRAME_H)
+            }
+        }
 
-        entry = BUTTON_IMAGE_HOLDER.get(label.lower())
+        self.button_styles = BUTTON_IMAGE_HOLDER
+
+        # every row shares one pitch (tallest button style plus spacing)
+        row_h = max(int(e["frame_size"][1] * max(1, *e["scales"])) for e in BUTTON_IMAGE_HOLDER.values())
+        pitch = row_h + BUTTON_SPACING
+        visible_rows = max(1, min(len(items), MENU_VISIBLE_ROWS))
+
+        # layout: virtual panel_rect for positioning (centered inside the window)
+        panel_w = BUTTON_WIDTH + 120
+        panel_h = (BUTTON_HEIGHT + BUTTON_PADDING) * visible_rows + 220
+        panel_rect = pygame.Rect(0, 0, panel_w, panel_h)
+        panel_rect.center = screen.get_rect().center
+        self.panel_rect = panel_rect
+
+        # Title and button block positions
+        self.title_y = panel_rect.y + 60
+        start_y = panel_rect.y + BUTTON_BLOCK_TOP_OFFSET
+
+        # the first row is centered on start_y, as the fixed layout was
+        viewport = pygame.Rect(panel_rect.x, start_y - pitch // 2, panel_rect.w, visible_rows * pitch)
+        self.menu_list = MenuList(len(items), viewport, pitch, self.make_button)
+
+        width, height = screen.get_size()
+        self.width, self.height = width, height
+
+        # particles (the quality tier decides how many are live)
+        particles = []
+        for _ in range(max(tier["particles"] for tier in self.manager.quality.tiers)):
+            pos = pygame.math.Vector2(random.random() * width, random.random() * height)
+            vel = pygame.math.Vector2((random.random() - 0.5) * 20, (random.random() - 0.5) * 12)
+            size = int(2 + random.random() * 4)
+            alpha = int(30 + random.random() * 80)
+            surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
+            pygame.draw.circle(surf, (255, 255, 255, alpha), (size, size), size)
+            particles.append({"pos": pos, "vel": vel, "size": size, "alpha": alpha, "surf": surf})
+        self.particles = particles
+
+        # load bitmap font (title, label-only buttons and HUD)
+        self.bitmap_font = load_bitmap_font(BITMAP_FONT_FILE)
+        glyph_w = self.bitmap_font.glyph_w
+
+        self.expanding = False
+        self.finishing = False
+        self.expand_button: Optional[Button] = None
+        self.expand_duration = 1.2
+        self.expand_elapsed = 0.0
+
+        self.title_scale = max(2.0, min(4.0, 3.0 * (glyph_w / 6.0)))
+        self.button_font_scale = max(1.0, glyph_w / 6.0 * 1.6)
+
+        # static text and the fallback gradient are rendered once, so every
+        # backend can treat them as unchanging textures
+        self.title_surf = self.bitmap_font.render(self.title, scale=self.title_scale, letter_spacing=LETTER_SPACING)
+        self.hint = self.hint_font.render("Use arrow keys or mouse. Press Enter to select.", True, (200, 200, 210))
+        self.bg_gradient = None
+        if not self.background:
+            top = pygame.Surface(screen.get_size())
+            for y in range(screen.get_height()):
+                tt = y / screen.get_height()
+                rcol = int(BG_COLOR[0] * (1 - tt) + 10 * tt)
+                gcol = int(BG_COLOR[1] * (1 - tt) + 20 * tt)
+                bcol = int(BG_COLOR[2] * (1 - tt) + 40 * tt)
+                pygame.draw.line(top, (rcol, gcol, bcol), (0, y), (screen.get_width(), y))
+            self.bg_gradient = top
+        self.preview_key = None
+        self.preview_source: Optional[pygame.Surface] = None
+
+        # FPS counter (toggled with F3)
+        self.hud = HudLayer(self.bitmap_font, (400, 52), pos=(10, 10))
+        self.hud_fps = self.hud.text(0, 0, 7)
+        self.hud_alloc = self.hud.text(0, 28, 16)
+        self.show_fps = False
+
+        # --- Scrolling background state ---
+        self.scroll_speed = 100
+
+    def make_button(self, i: int) -> Button:
+        label, action = self.items[i]
+        entry = self.button_styles.get(label.lower())
         if entry:
             imgs = entry["imgs"]
             scales = entry["scales"]
@@ -346,13 +536,13 @@ def run_menu(screen: pygame.Surface, clock: pygame.time.Clock, title: str, items
 
         # Use the maximum scale among states to size the collision rect so hover fits
         max_scale = max(1, scale_n, scale_h, scale_p)
+        if not entry:
+            # label-only rows are sized like a start button
+            max_scale = max(1, START_SCALE_NORMAL, START_SCALE_HOVER, START_SCALE_PRESSED)
 
         base_w = int(frame_w * max_scale)
         base_h = int(frame_h * max_scale)
-
-        by = start_y + i * (base_h + BUTTON_SPACING)
         rect = pygame.Rect(0, 0, base_w, base_h)
-        rect.center = (bx, by)
 
         if label.lower().startswith("play"):
             def make_trigger(act):
@@ -361,144 +551,57 @@ def run_menu(screen: pygame.Surface, clock: pygame.time.Clock, title: str, items
                 trigger._trigger = False
                 trigger._orig = act
                 return trigger
-            wrapped = make_trigger(action)
-            buttons.append(Button("", rect, wrapped,
-                                  image=normal, image_hover=hover, image_pressed=press,
-                                  scale_normal=scale_n, scale_hover=scale_h, scale_pressed=scale_p))
-        else:
-            buttons.append(Button("", rect, action,
-                                  image=normal, image_hover=hover, image_pressed=press,
-                                  scale_normal=scale_n, scale_hover=scale_h, scale_pressed=scale_p))
-
-    selected_idx = 0
-    if buttons:
-        buttons[selected_idx].hovered = True
-
-    width, height = screen.get_size()
-
-    # particles
-    particles = []
-    for _ in range(28):
-        pos = pygame.math.Vector2(random.random() * width, random.random() * height)
-        vel = pygame.math.Vector2((random.random() - 0.5) * 20, (random.random() - 0.5) * 12)
-        size = int(2 + random.random() * 4)
-        alpha = int(30 + random.random() * 80)
-        particles.append({"pos": pos, "vel": vel, "size": size, "alpha": alpha})
-
-    # load bitmap font (title only)
-    sheet = load_image(BITMAP_FONT_FILE)
-
-    # measured grid values (from detector)
-    glyph_w = 6
-    glyph_h = 8
-    cols = 10
-    rows = 5
-    margin_x = 1
-    margin_y = 1
-    spacing_x = 2
-    spacing_y = 2
-
-    CHARS_ORDER = (
-        "ABCDEFGHIJ"
-        "KLMNOPQRST"
-        "UVWXYZ0123"
-        "456789.,:?!()+-"
-    )
-
-    bitmap_font = BitmapFont(sheet, CHARS_ORDER, glyph_w, glyph_h,
-                             cols, rows, margin_x, margin_y, spacing_x, spacing_y,
-                             alpha_threshold=128, padding=0)
-
-    expanding = False
-    expand_button: Optional[Button] = None
-    expand_duration = 1.2
-    expand_elapsed = 0.0
-
-    title_scale = max(2.0, min(4.0, 3.0 * (glyph_w / 6.0)))
-    button_font_scale = max(1.0, glyph_w / 6.0 * 1.6)
-
-    # --- Scrolling background state ---
-    scroll_x = 0.0
-    scroll_speed = 100
-    sway_amplitude = 0
-    sway_frequency = 0
-
-    while True:
-        dt = clock.tick(FPS) / 1000.0
+            action = make_trigger(action)
+        return Button(label, rect, action,
+                      image=normal, image_hover=hover, image_pressed=press,
+                      scale_normal=scale_n, scale_hover=scale_h, scale_pressed=scale_p)
+
+    def handle_event(self, event: pygame.event.Event):
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_F3:
+            self.show_fps = not self.show_fps
+        if not self.expanding:
+            self.menu_list.handle_event(event)
+
+    def update(self, dt: float):
         mouse_pos = pygame.mouse.get_pos()
+        width, height = self.width, self.height
 
-        # detect play trigger
-        if not expanding:
-            for b in buttons:
+        if self.preloader and not self.preloader.done:
+            self.preloader.pump()
+
+        self.hud_fps.set("FPS %d" % self.manager.clock.get_fps() if self.show_fps else "")
+        self.hud_alloc.set(allocation_counter(self.manager.allocations) if self.show_fps else "")
+
+        # the final expansion frame has been shown; hand over to the action
+        if self.finishing:
+            self.finish_expansion()
+            return
+
+        # detect play trigger (only visible rows can have been activated)
+        if not self.expanding:
+            for b in self.menu_list.visible_buttons():
                 if callable(b.action) and getattr(b.action, "_trigger", False):
-                    expanding = True
-                    expand_button = b
-                    expand_elapsed = 0.0
+                    self.expanding = True
+                    self.expand_button = b
+                    self.expand_elapsed = 0.0
                     b.action._trigger = False
                     b.text_alpha = 255
-                    for p in particles:
-                        p["vel"] *= 1.6
                     break
 
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if not expanding:
-                if event.type == pygame.KEYDOWN:
-                    if event.key in (pygame.K_DOWN, pygame.K_s):
-                        buttons[selected_idx].hovered = False
-                        selected_idx = (selected_idx + 1) % len(buttons)
-                        buttons[selected_idx].hovered = True
-                    elif event.key in (pygame.K_UP, pygame.K_w):
-                        buttons[selected_idx].hovered = False
-                        selected_idx = (selected_idx - 1) % len(buttons)
-                        buttons[selected_idx].hovered = True
-                    elif event.key in (pygame.K_RETURN, pygame.K_SPACE):
-                        if buttons[selected_idx].action:
-                            buttons[selected_idx].action()
-            for b in buttons:
-                b.handle_event(event, mouse_pos)
-
-        if not expanding:
-            for i, b in enumerate(buttons):
-                if b.rect.collidepoint(mouse_pos):
-                    if not b.hovered:
-                        buttons[selected_idx].hovered = False
-                        selected_idx = i
-                    b.hovered = True
-                else:
-                    if i != selected_idx:
-                        b.hovered = False
-
-        for b in buttons:
-            if not expanding:
-                b.update(dt)
-
-        # background (horizontal looping scroll + subtle vertical sway)
-        if bg_img:
-            scroll_x = (scroll_x + scroll_speed * dt) % width
-            sx = int(scroll_x)
-            t = pygame.time.get_ticks() / 1000.0
-            offset_y = int(sway_amplitude * math.sin(2 * math.pi * sway_frequency * t))
-            screen.blit(bg_img, (-sx, offset_y))
-            screen.blit(bg_img, (width - sx, offset_y))
-        else:
-            top = pygame.Surface(screen.get_size())
-            for y in range(screen.get_height()):
-                tt = y / screen.get_height()
-                rcol = int(BG_COLOR[0] * (1 - tt) + 10 * tt)
-                gcol = int(BG_COLOR[1] * (1 - tt) + 20 * tt)
-                bcol = int(BG_COLOR[2] * (1 - tt) + 40 * tt)
-                pygame.draw.line(top, (rcol, gcol, bcol), (0, y), (screen.get_width(), y))
-            screen.blit(top, (0, 0))
+        if not self.expanding:
+            self.menu_list.update(dt, mouse_pos)
 
-        # particles
-        for p in particles:
-            if expanding:
-                p["pos"] += p["vel"] * dt * 2.2
-            else:
-                p["pos"] += p["vel"] * dt
+        quality = self.manager.quality
+
+        # background (horizontal looping scroll)
+        if self.background and quality.get("background_scroll"):
+            self.background.scroll(self.scroll_speed * dt)
+
+        # particles (sped up while Play expands; base velocities stay as they
+        # are, so the boost does not stack when the menu is resumed)
+        speed = 1.6 * 2.2 if self.expanding else 1.0
+        for p in self.particles[:quality.get("particles")]:
+            p["pos"] += p["vel"] * dt * speed
             if p["pos"].x < -20:
                 p["pos"].x = width + 20
             if p["pos"].x > width + 20:
@@ -507,26 +610,16 @@ def run_menu(screen: pygame.Surface, clock: pygame.time.Clock, title: str, items
                 p["pos"].y = height + 20
             if p["pos"].y > height + 20:
                 p["pos"].y = -20
-            surf = pygame.Surface((p["size"] * 2, p["size"] * 2), pygame.SRCALPHA)
-            pygame.draw.circle(surf, (255, 255, 255, p["alpha"]), (p["size"], p["size"]), p["size"])
-            screen.blit(surf, (p["pos"].x - p["size"], p["pos"].y - p["size"]))
-
-        # title / logo
-        if logo_img:
-            logo_rect = logo_img.get_rect(center=(panel_rect.centerx, title_y))
-            screen.blit(logo_img, logo_rect)
-        else:
-            title_surf = bitmap_font.render(title, scale=title_scale, letter_spacing=LETTER_SPACING)
-            title_rect = title_surf.get_rect(center=(panel_rect.centerx, title_y))
-            screen.blit(title_surf, title_rect)
 
-        # expansion animation (blur preview from play button image)
-        if expanding and expand_button:
-            expand_elapsed += dt
-            t = min(expand_elapsed / expand_duration, 1.0)
+        # expansion animation progress
+        if self.expanding and self.expand_button:
+            self.expand_elapsed += dt
+            t = min(self.expand_elapsed / self.expand_duration, 1.0)
             e = ease_out_cubic(smoothstep(t))
+            self.expand_t = t
+            self.expand_e = e
 
-            start = expand_button.rect
+            start = self.expand_button.rect
             start_center = pygame.math.Vector2(start.centerx, start.centery)
             target_center = pygame.math.Vector2(width / 2, height / 2)
             center = start_center.lerp(target_center, e)
@@ -536,17 +629,89 @@ def run_menu(screen: pygame.Surface, clock: pygame.time.Clock, title: str, items
             size = start_size.lerp(target_size, e)
             r = pygame.Rect(0, 0, max(1, int(size.x)), max(1, int(size.y)))
             r.center = (int(center.x), int(center.y))
+            self.expand_rect = r
 
-            # shadow (kept for expansion only; buttons themselves have no shadows)
-            shadow = pygame.Surface((r.w, r.h), pygame.SRCALPHA)
-            shadow.fill((0, 0, 0, int(120 * e)))
-            screen.blit(shadow, (r.x + 8, r.y + 8))
+            # push particles outward slightly
+            for p in self.particles[:quality.get("particles")]:
+                dir_vec = (p["pos"] - center)
+                if dir_vec.length() == 0:
+                    dir_vec = pygame.math.Vector2(random.random() - 0.5, random.random() - 0.5)
+                dir_vec = dir_vec.normalize()
+                p["pos"] += dir_vec * (30 * e) * dt
+
+            # when animation completes, the next draw shows the final preview
+            # and the next update calls the original action
+            if t >= 1.0:
+                self.finishing = True
+
+    def finish_expansion(self):
+        expand_button = self.expand_button
+        self.finishing = False
+        self.expanding = False
+        self.expand_button = None
+        if expand_button is None:
+            return
+        expand_button.text_alpha = 255
+        orig = getattr(expand_button.action, "_orig", None)
+        if self.preloader:
+            # only blocks if the background load has not caught up yet
+            self.preloader.wait()
+        if callable(orig):
+            result = orig()
+            if result == "quit":
+                pygame.quit()
+                sys.exit()
+
+    def preview_texture_source(self, img: pygame.Surface, radius: int) -> pygame.Surface:
+        # Texture backend: blur the preview once at full size and let the
+        # renderer scale it each frame instead of re-scaling surfaces.
+        key = (id(img), radius)
+        if self.preview_key != key:
+            self.preview_key = key
+            self.preview_source = blur_surface(nearest_scale(img, (self.width, self.height)), radius)
+        return self.preview_source
+
+    def draw(self, screen):
+        width, height = self.width, self.height
+        panel_rect = self.panel_rect
+        quality = self.manager.quality
+        overlays = quality.get("expansion_overlays")
+        blur_cap = quality.get("blur_radius")
+
+        # background (parallax layers, one blit each)
+        if self.background:
+            self.background.draw(screen)
+        else:
+            screen.blit(self.bg_gradient, (0, 0))
 
-            img_for_preview, _ = expand_button.current_image_and_scale()
-            if img_for_preview:
+        # particles
+        for p in self.particles[:quality.get("particles")]:
+            screen.blit(p["surf"], (p["pos"].x - p["size"], p["pos"].y - p["size"]))
+
+        # title / logo
+        if self.logo_img:
+            logo_rect = self.logo_img.get_rect(center=(panel_rect.centerx, self.title_y))
+            screen.blit(self.logo_img, logo_rect)
+        else:
+            title_rect = self.title_surf.get_rect(center=(panel_rect.centerx, self.title_y))
+            screen.blit(self.title_surf, title_rect)
+
+        # expansion animation (blur preview from play button image)
+        if self.expanding and self.expand_button:
+            t, e, r = self.expand_t, self.expand_e, self.expand_rect
+
+            # shadow (kept for expansion only; buttons themselves have no shadows)
+            if overlays:
+                screen.fill_rect((0, 0, 0, int(120 * e)), r.move(8, 8))
+
+            img_for_preview, _ = self.expand_button.current_image_and_scale()
+            final_radius = min(blur_cap, max(2, int((width * width + height * height) ** 0.5) // 120))
+            if img_for_preview and screen.scales_on_copy:
+                screen.blit_scaled(self.preview_texture_source(img_for_preview, final_radius), r, alpha=128)
+            elif img_for_preview:
                 scaled_img = nearest_scale(img_for_preview, (r.w, r.h))
                 diag = int((r.w * r.w + r.h * r.h) ** 0.5)
-                blur_radius = max(2, min(18, diag // 120))
+                blur_radius = min(blur_cap, max(2, min(18, diag // 120)))
                 blurred = blur_surface(scaled_img, blur_radius)
                 preview_copy = blurred.copy()
                 preview_copy.set_alpha(128)  # 50% opacity
@@ -557,66 +722,72 @@ def run_menu(screen: pygame.Surface, clock: pygame.time.Clock, title: str, items
                     int(BG_COLOR[1] + (ACCENT[1] - BG_COLOR[1]) * e),
                     int(BG_COLOR[2] + (ACCENT[2] - BG_COLOR[2]) * e),
                 )
-                pygame.draw.rect(screen, color, r, border_radius=max(6, int(24 * (1 - (1 - e) * 0.8))))
+                screen.draw_rect(color, r, border_radius=max(6, int(24 * (1 - (1 - e) * 0.8))))
 
             # subtle border
-            border = pygame.Surface((r.w, r.h), pygame.SRCALPHA)
-            pygame.draw.rect(border, (255, 255, 255, int(30 * (1 - e))), border.get_rect(), width=2, border_radius=8)
-            screen.blit(border, r.topleft)
+            if overlays:
+                screen.draw_rect((255, 255, 255, int(30 * (1 - e))), r, width=2, border_radius=8)
 
             # subtle overlay flash near completion
-            if t > 0.85:
+            if overlays and t > 0.85:
                 flash_alpha = int(255 * (t - 0.85) / 0.15)
-                flash = pygame.Surface((width, height), pygame.SRCALPHA)
-                flash.fill((255, 255, 255, min(120, flash_alpha)))
-                screen.blit(flash, (0, 0), special_flags=pygame.BLEND_RGBA_ADD)
-
-            # push particles outward slightly
-            for p in particles:
-                dir_vec = (p["pos"] - center)
-                if dir_vec.length() == 0:
-                    dir_vec = pygame.math.Vector2(random.random() - 0.5, random.random() - 0.5)
-                dir_vec = dir_vec.normalize()
-                p["pos"] += dir_vec * (30 * e) * dt
-
-            # when animation completes, ensure final preview is visible then call original action
-            if t >= 1.0:
-                if img_for_preview:
+                screen.fill_rect((255, 255, 255, min(120, flash_alpha)), screen.get_rect(),
+                                 special_flags=pygame.BLEND_RGBA_ADD)
+
+            # ensure the final preview is visible before the action runs
+            if self.finishing and img_for_preview:
+                if screen.scales_on_copy:
+                    screen.blit_scaled(self.preview_texture_source(img_for_preview, final_radius),
+                                       screen.get_rect(), alpha=128)
+                else:
                     final_img = nearest_scale(img_for_preview, (width, height))
-                    final_blurred = blur_surface(final_img, max(2, int((width * width + height * height) ** 0.5) // 120))
+                    final_blurred = blur_surface(final_img, final_radius)
                     final_blurred.set_alpha(128)
                     screen.blit(final_blurred, (0, 0))
-                    pygame.display.flip()
-                orig = getattr(expand_button.action, "_orig", None)
-                if callable(orig):
-                    result = orig()
-                    if result == "quit":
-                        pygame.quit()
-                        sys.exit()
-                expanding = False
-                expand_button.text_alpha = 255
-                expand_button = None
 
         else:
-            for b in buttons:
-                b.draw(screen, font, bitmap_font, button_font_scale)
+            self.menu_list.draw(screen, self.font, self.bitmap_font, self.button_font_scale)
 
         # footer hint
-        hint = pygame.font.Font(FONT_NAME, 16).render("Use arrow keys or mouse. Press Enter to select.", True, (200, 200, 210))
-        hint_rect = hint.get_rect(center=(panel_rect.centerx, panel_rect.bottom - 28))
-        screen.blit(hint, hint_rect)
+        hint_rect = self.hint.get_rect(center=(panel_rect.centerx, panel_rect.bottom - 28))
+        screen.blit(self.hint, hint_rect)
 
-        pygame.display.flip()
+        # preload progress bar (hidden once everything is ready)
+        if self.preloader and not self.preloader.done:
+            bar = pygame.Rect(0, 0, 200, 4)
+            bar.center = (panel_rect.centerx, hint_rect.bottom + 10)
+            screen.draw_rect((60, 60, 80), bar)
+            screen.draw_rect(ACCENT, pygame.Rect(bar.x, bar.y, int(bar.w * self.preloader.progress), bar.h))
+
+        self.hud.draw(screen)
+
+
+# --- Menu runner ---
+def run_menu(screen, clock: pygame.time.Clock, title: str, items: List[Tuple[str, Callable]],
+             preloader: Optional[AssetPreloader] = None, manager: Optional[SceneManager] = None):
+    if manager is None:
+        manager = SceneManager(as_canvas(screen), clock, FPS)
+    manager.push(MenuScene(title, items, preloader=preloader))
+    manager.run()
+    pygame.quit()
+    sys.exit()
 
 # --- Main ---
 def main():
-    window = pygame.display.set_mode(SCREEN_SIZE)
-    pygame.display.set_caption("Game Menu")
+    allocations = tracer_from_env()
+    if allocations is not None:
+        atexit.register(allocations.print_report)
+    window = create_canvas(SCREEN_SIZE, "Game Menu", RENDER_BACKEND, software=RENDER_SOFTWARE,
+                           divisor=RENDER_DIVISOR)
     clock = pygame.time.Clock()
 
+    # menu, game and pause share this window, clock and the asset cache
+    manager = SceneManager(window, clock, FPS, allocations=allocations)
+    game_scene = game.GameScene()
+
     def start_action():
         # This function is called when Play finishes expanding.
-        return game.main(window)
+        manager.push(game_scene)
 
     def quit_action():
         pygame.quit()
@@ -627,7 +798,8 @@ def main():
         ("Exit", quit_action),
     ]
 
-    run_menu(window, clock, "CAPTURE THE FLAG", menu_items)
+    preloader = AssetPreloader(game.asset_paths())
+    run_menu(window, clock, "CAPTURE THE FLAG", menu_items, preloader=preloader, manager=manager)
 
 if __name__ == "__main__":
     main()
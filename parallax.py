@@ -0,0 +1,78 @@
+from typing import List, Tuple
+
+import pygame
+
+from assets import convert
+
+# --- Parallax background ---
+# Each layer is pre-tiled once into a strip one image period wider than the
+# view (plus vertical repeats if asked), so any scroll offset is a single
+# blit of a window into the strip. Layers without transparent pixels are
+# stored without an alpha channel, which makes that blit a plain copy.
+
+
+def is_opaque(image: pygame.Surface) -> bool:
+    if image.get_colorkey() is not None:
+        return False
+    alpha = image.get_alpha()
+    if alpha is not None and alpha < 255:
+        return False
+    if not image.get_flags() & pygame.SRCALPHA:
+        return True
+    w, h = image.get_size()
+    return pygame.mask.from_surface(image, 254).count() == w * h
+
+
+class ParallaxLayer:
+    # speed is how far the layer moves per unit of scroll/camera movement
+    # (1.0 moves with the camera, 0.0 stays put).
+
+    def __init__(self, image: pygame.Surface, view_size: Tuple[int, int], speed: float = 1.0,
+                 y: int = 0, repeat_y: bool = False):
+        self.speed = speed
+        self.y = y
+        self.offset = 0.0
+        self.period = image.get_width()
+        self.opaque = is_opaque(image)
+
+        view_w, view_h = view_size
+        tile_w, tile_h = image.get_size()
+        cols = -(-view_w // tile_w) + 1
+        rows = max(1, -(-(view_h - y) // tile_h)) if repeat_y else 1
+        strip = pygame.Surface((tile_w * cols, tile_h * rows), 0 if self.opaque else pygame.SRCALPHA, 32)
+        for i in range(cols):
+            for j in range(rows):
+                strip.blit(image, (i * tile_w, j * tile_h))
+        self.strip = convert(strip, alpha=not self.opaque)
+        self.area = pygame.Rect(0, 0, min(view_w, strip.get_width()), min(view_h - y, strip.get_height()))
+
+    def scroll(self, dx: float):
+        self.offset = (self.offset + dx * self.speed) % self.period
+
+    def draw(self, canvas, camera_x: float = 0):
+        self.area.x = int(self.offset + camera_x * self.speed) % self.period
+        canvas.blit(self.strip, (0, self.y), self.area)
+
+
+class ParallaxBackground:
+    # Layers are drawn in the order they were added (farthest first).
+
+    def __init__(self, view_size: Tuple[int, int]):
+        self.view_size = view_size
+        self.layers: List[ParallaxLayer] = []
+
+    def add_layer(self, image: pygame.Surface, speed: float = 1.0, y: int = 0,
+                  repeat_y: bool = False) -> ParallaxLayer:
+        layer = ParallaxLayer(image, self.view_size, speed, y, repeat_y)
+        self.layers.append(layer)
+        return layer
+
+    def scroll(self, dx: float):
+        # Advances every layer by dx * its speed (for backgrounds that move
+        # on their own, like the menu's).
+        for layer in self.layers:
+            layer.scroll(dx)
+
+    def draw(self, canvas, camera_x: float = 0):
+        for layer in self.layers:
+            layer.draw(canvas, camera_x)
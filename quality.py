@@ -0,0 +1,100 @@
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+# --- Effect tiers (lowest first) ---
+# Every effect that can be scaled down reads its setting from the current
+# tier through QualityGovernor.get(); the governor never touches effects
+# itself.
+QUALITY_TIERS: List[Dict[str, Any]] = [
+    {
+        "name": "low",
+        "particles": 8,
+        "blur_radius": 0,            # upper bound for blur_surface radius
+        "expansion_overlays": False,  # shadow, border and flash during Play expansion
+        "background_scroll": False,
+    },
+    {
+        "name": "medium",
+        "particles": 16,
+        "blur_radius": 6,
+        "expansion_overlays": True,
+        "background_scroll": True,
+    },
+    {
+        "name": "high",
+        "particles": 28,
+        "blur_radius": 18,
+        "expansion_overlays": True,
+        "background_scroll": True,
+    },
+]
+
+
+# --- Frame-time driven tier selection ---
+class QualityGovernor:
+    # Feed record() with the time each frame spent working (not sleeping in
+    # Clock.tick). When the rolling average gets close to the frame budget the
+    # tier drops; when it stays well under the budget the tier rises again.
+    # The gap between the two thresholds plus the refill of the window after
+    # every change keeps the tier from oscillating; an upgrade that has to be
+    # undone straight away doubles how long the next one has to wait.
+
+    def __init__(self, fps: int, tiers: Optional[List[Dict[str, Any]]] = None,
+                 window: int = 60, downgrade_at: float = 0.9, upgrade_at: float = 0.5,
+                 tier: Optional[int] = None):
+        self.tiers = tiers or QUALITY_TIERS
+        self.budget = 1.0 / fps
+        self.downgrade_at = downgrade_at
+        self.upgrade_at = upgrade_at
+        self.samples: deque = deque(maxlen=window)
+        self.total = 0.0
+        self.tier = len(self.tiers) - 1 if tier is None else tier
+        self.locked = False
+        self.calm_frames = 0
+        self.upgrade_patience = 1
+        self.just_upgraded = False
+
+    @property
+    def name(self) -> str:
+        return self.tiers[self.tier]["name"]
+
+    def get(self, effect: str) -> Any:
+        return self.tiers[self.tier][effect]
+
+    def lock(self, tier: Optional[int]):
+        # Pins the tier (e.g. from a settings menu); None re-enables adapting.
+        self.locked = tier is not None
+        if tier is not None:
+            self.set_tier(tier)
+
+    def set_tier(self, tier: int):
+        self.tier = max(0, min(len(self.tiers) - 1, tier))
+        self.samples.clear()
+        self.total = 0.0
+        self.calm_frames = 0
+
+    def record(self, frame_time: float) -> bool:
+        # Returns True when the tier changed.
+        if len(self.samples) == self.samples.maxlen:
+            self.total -= self.samples[0]
+        self.samples.append(frame_time)
+        self.total += frame_time
+        if self.locked or len(self.samples) < self.samples.maxlen:
+            return False
+
+        average = self.total / len(self.samples)
+        just_upgraded, self.just_upgraded = self.just_upgraded, False
+        if average > self.budget * self.downgrade_at and self.tier > 0:
+            if just_upgraded:
+                self.upgrade_patience = min(self.upgrade_patience * 2, 32)
+            self.set_tier(self.tier - 1)
+            return True
+        if average < self.budget * self.upgrade_at and self.tier < len(self.tiers) - 1:
+            self.calm_frames += 1
+            if self.calm_frames >= self.samples.maxlen * self.upgrade_patience:
+                self.set_tier(self.tier + 1)
+                self.just_upgraded = True
+                return True
+        else:
+            self.calm_frames = 0
+        return False
@@ -0,0 +1,372 @@
+from typing import Dict, Optional, Tuple
+
+import pygame
+
+# --- Render backends ---
+# Scenes draw onto a canvas instead of the display Surface. Both canvases
+# take Surface-style blit() calls, plus blit_scaled()/fill_rect()/draw_rect()
+# for the things a texture renderer can do without building temporary
+# surfaces. SurfaceCanvas is the default and composites on the CPU exactly
+# as before; TextureCanvas uploads each source surface once and lets SDL's
+# renderer do scaling and blending at copy time.
+#
+# Either backend can render at an internal resolution `divisor` times
+# smaller than the window and present it with one nearest-neighbour scale.
+# Scenes keep drawing and hit-testing in window coordinates; the canvas maps
+# every rect onto the small target, so mouse positions need no mapping.
+
+Color = Tuple[int, ...]
+
+
+def _alpha_of(color: Color) -> int:
+    return color[3] if len(color) > 3 else 255
+
+
+def _has_alpha(source: pygame.Surface) -> bool:
+    alpha = source.get_alpha()
+    return (bool(source.get_flags() & pygame.SRCALPHA) or source.get_colorkey() is not None
+            or (alpha is not None and alpha < 255))
+
+
+def _down(rect, divisor: int) -> pygame.Rect:
+    # Window-space rect -> internal-target rect (edges rounded down).
+    rect = pygame.Rect(rect)
+    x, y = rect.x // divisor, rect.y // divisor
+    return pygame.Rect(x, y, rect.right // divisor - x, rect.bottom // divisor - y)
+
+
+class SurfaceCanvas:
+    scales_on_copy = False
+
+    def __init__(self, surface: pygame.Surface):
+        self.surface = surface
+
+    def get_size(self) -> Tuple[int, int]:
+        return self.surface.get_size()
+
+    def get_width(self) -> int:
+        return self.surface.get_width()
+
+    def get_height(self) -> int:
+        return self.surface.get_height()
+
+    def get_rect(self, **kwargs) -> pygame.Rect:
+        return self.surface.get_rect(**kwargs)
+
+    def get_clip(self) -> pygame.Rect:
+        return self.surface.get_clip()
+
+    def set_clip(self, rect: Optional[pygame.Rect]):
+        self.surface.set_clip(rect)
+
+    def begin(self):
+        pass
+
+    def invalidate(self, source: pygame.Surface):
+        pass
+
+    def present(self):
+        pygame.display.flip()
+
+    def fill(self, color: Color):
+        self.surface.fill(color)
+
+    def blit(self, source: pygame.Surface, dest, area=None, special_flags: int = 0):
+        return self.surface.blit(source, dest, area, special_flags)
+
+    def blit_scaled(self, source: pygame.Surface, rect: pygame.Rect, alpha: Optional[int] = None):
+        scaled = pygame.transform.scale(source, rect.size)
+        if alpha is not None:
+            scaled.set_alpha(alpha)
+        self.surface.blit(scaled, rect.topleft)
+
+    def fill_rect(self, color: Color, rect: pygame.Rect, special_flags: int = 0):
+        if _alpha_of(color) == 255 and not special_flags:
+            self.surface.fill(color, rect)
+            return
+        layer = pygame.Surface(rect.size, pygame.SRCALPHA)
+        layer.fill(color)
+        self.surface.blit(layer, rect.topleft, special_flags=special_flags)
+
+    def draw_rect(self, color: Color, rect: pygame.Rect, width: int = 0, border_radius: int = -1):
+        if _alpha_of(color) == 255:
+            pygame.draw.rect(self.surface, color, rect, width=width, border_radius=border_radius)
+            return
+        layer = pygame.Surface(rect.size, pygame.SRCALPHA)
+        pygame.draw.rect(layer, color, layer.get_rect(), width=width, border_radius=border_radius)
+        self.surface.blit(layer, rect.topleft)
+
+
+class ScaledSurfaceCanvas(SurfaceCanvas):
+    # SurfaceCanvas drawing into a target `divisor` times smaller than the
+    # display. Sources are reduced once with a nearest-neighbour scale and
+    # cached like TextureCanvas's textures (same invalidate() contract and
+    # eviction); blit_scaled() goes straight to the reduced size, so scenes
+    # should prefer it (scales_on_copy) over scaling surfaces themselves.
+    scales_on_copy = True
+    EVICT_AFTER = 120
+
+    def __init__(self, display: pygame.Surface, divisor: int):
+        self.display = display
+        self.divisor = divisor
+        self.size = display.get_size()
+        super().__init__(pygame.Surface((self.size[0] // divisor, self.size[1] // divisor), 0, display))
+        self.frame = 0
+        # id(source) -> [source, reduced copy, last frame used]
+        self.reduced_cache: Dict[int, list] = {}
+
+    def get_size(self) -> Tuple[int, int]:
+        return self.size
+
+    def get_width(self) -> int:
+        return self.size[0]
+
+    def get_height(self) -> int:
+        return self.size[1]
+
+    def get_rect(self, **kwargs) -> pygame.Rect:
+        return _rect_with(self.size, kwargs)
+
+    def get_clip(self) -> pygame.Rect:
+        clip = self.surface.get_clip()
+        d = self.divisor
+        return pygame.Rect(clip.x * d, clip.y * d, clip.w * d, clip.h * d)
+
+    def set_clip(self, rect: Optional[pygame.Rect]):
+        self.surface.set_clip(None if rect is None else _down(rect, self.divisor))
+
+    def present(self):
+        pygame.transform.scale(self.surface, self.size, self.display)
+        pygame.display.flip()
+        self.frame += 1
+        if self.frame % self.EVICT_AFTER == 0:
+            stale = self.frame - self.EVICT_AFTER
+            for key in [k for k, (_, _, used) in self.reduced_cache.items() if used < stale]:
+                del self.reduced_cache[key]
+
+    def invalidate(self, source: pygame.Surface):
+        entry = self.reduced_cache.get(id(source))
+        if entry is not None and entry[0] is source:
+            del self.reduced_cache[id(source)]
+
+    def reduced(self, source: pygame.Surface) -> pygame.Surface:
+        # Surface alpha and colorkey are copied when the source is first
+        # reduced; call invalidate() after changing them.
+        entry = self.reduced_cache.get(id(source))
+        if entry is not None and entry[0] is source:
+            entry[2] = self.frame
+            return entry[1]
+        w, h = source.get_size()
+        small = pygame.transform.scale(source, (max(1, w // self.divisor), max(1, h // self.divisor)))
+        small.set_alpha(source.get_alpha())
+        small.set_colorkey(source.get_colorkey())
+        self.reduced_cache[id(source)] = [source, small, self.frame]
+        return small
+
+    def blit(self, source: pygame.Surface, dest, area=None, special_flags: int = 0):
+        d = self.divisor
+        if area is not None:
+            area = _down(area, d)
+        self.surface.blit(self.reduced(source), (int(dest[0]) // d, int(dest[1]) // d), area, special_flags)
+        return pygame.Rect(dest[0], dest[1], *(area.size if area is not None else source.get_size()))
+
+    def blit_scaled(self, source: pygame.Surface, rect: pygame.Rect, alpha: Optional[int] = None):
+        super().blit_scaled(source, _down(rect, self.divisor), alpha)
+
+    def fill_rect(self, color: Color, rect: pygame.Rect, special_flags: int = 0):
+        super().fill_rect(color, _down(rect, self.divisor), special_flags)
+
+    def draw_rect(self, color: Color, rect: pygame.Rect, width: int = 0, border_radius: int = -1):
+        d = self.divisor
+        super().draw_rect(color, _down(rect, d), width=max(1, width // d) if width > 0 else width,
+                          border_radius=border_radius // d if border_radius > 0 else border_radius)
+
+
+class TextureCanvas:
+    # Source surfaces are treated as immutable once drawn: a texture is
+    # uploaded the first time a surface is seen and reused while that
+    # surface object stays alive and keeps being drawn. Callers that redraw
+    # into a surface call invalidate() on it. Textures unused for
+    # EVICT_AFTER frames are released. With divisor > 1 the frame is drawn
+    # into a small target texture that present() stretches over the window.
+    scales_on_copy = True
+    EVICT_AFTER = 120
+
+    def __init__(self, size: Tuple[int, int], title: str = "", software: bool = False, divisor: int = 1):
+        from pygame._sdl2 import video
+
+        self.video = video
+        self.window = video.Window(title, size=size)
+        self.renderer = video.Renderer(self.window, accelerated=0 if software else -1)
+        self.size = size
+        self.divisor = divisor
+        self.target = None
+        if divisor > 1:
+            self.target = video.Texture(self.renderer, (size[0] // divisor, size[1] // divisor), target=True)
+        self.clip: Optional[pygame.Rect] = None
+        self.frame = 0
+        # id(surface) -> (surface, texture, last frame used); the surface is
+        # kept so its id cannot be reused while the texture is cached
+        self.textures: Dict[int, Tuple[pygame.Surface, object, int]] = {}
+
+    def get_size(self) -> Tuple[int, int]:
+        return self.size
+
+    def get_width(self) -> int:
+        return self.size[0]
+
+    def get_height(self) -> int:
+        return self.size[1]
+
+    def get_rect(self, **kwargs) -> pygame.Rect:
+        return _rect_with(self.size, kwargs)
+
+    def get_clip(self) -> pygame.Rect:
+        return self.clip.copy() if self.clip else pygame.Rect((0, 0), self.size)
+
+    def set_clip(self, rect: Optional[pygame.Rect]):
+        full = pygame.Rect((0, 0), self.size)
+        self.clip = None if rect is None or pygame.Rect(rect).contains(full) else pygame.Rect(rect).clip(full)
+
+    def begin(self):
+        self.renderer.target = self.target
+        self.renderer.draw_color = (0, 0, 0, 255)
+        self.renderer.clear()
+
+    def present(self):
+        if self.target is not None:
+            self.renderer.target = None
+            self.target.draw(dstrect=pygame.Rect((0, 0), self.size))
+        self.renderer.present()
+        self.frame += 1
+        if self.frame % self.EVICT_AFTER == 0:
+            stale = self.frame - self.EVICT_AFTER
+            for key in [k for k, (_, _, used) in self.textures.items() if used < stale]:
+                del self.textures[key]
+
+    def invalidate(self, source: pygame.Surface):
+        # Re-uploads the pixels of a surface that was drawn into.
+        entry = self.textures.get(id(source))
+        if entry is not None and entry[0] is source:
+            entry[1].update(source)
+
+    def texture(self, source: pygame.Surface):
+        entry = self.textures.get(id(source))
+        if entry is None or entry[0] is not source:
+            tex = self.video.Texture.from_surface(self.renderer, source)
+        else:
+            tex = entry[1]
+        self.textures[id(source)] = (source, tex, self.frame)
+        alpha = source.get_alpha()
+        tex.alpha = 255 if alpha is None else alpha
+        return tex
+
+    def _clipped(self, dst: pygame.Rect, src: pygame.Rect):
+        # Trims dst to the clip rect and trims src by the same proportion,
+        # then maps dst onto the render target.
+        if self.divisor > 1:
+            dst, src = self._clipped_window(dst, src)
+            return (None, None) if dst is None else (_down(dst, self.divisor), src)
+        return self._clipped_window(dst, src)
+
+    def _clipped_window(self, dst: pygame.Rect, src: pygame.Rect):
+        if self.clip is None:
+            return dst, src
+        visible = dst.clip(self.clip)
+        if not visible.w or not visible.h:
+            return None, None
+        if visible == dst:
+            return dst, src
+        sx = src.w / dst.w
+        sy = src.h / dst.h
+        src = pygame.Rect(src.x + round((visible.x - dst.x) * sx), src.y + round((visible.y - dst.y) * sy),
+                          max(1, round(visible.w * sx)), max(1, round(visible.h * sy)))
+        return visible, src
+
+    def _copy(self, source: pygame.Surface, dst: pygame.Rect, src: pygame.Rect, special_flags: int = 0):
+        dst, src = self._clipped(dst, src)
+        if dst is None:
+            return
+        tex = self.texture(source)
+        if special_flags in (pygame.BLEND_ADD, pygame.BLEND_RGBA_ADD):
+            tex.blend_mode = 2
+        else:
+            # opaque sources are copied without blending, like Surface.blit
+            tex.blend_mode = 1 if _has_alpha(source) else 0
+        tex.draw(srcrect=src, dstrect=dst)
+
+    def fill(self, color: Color):
+        self.fill_rect(color, pygame.Rect((0, 0), self.size))
+
+    def blit(self, source: pygame.Surface, dest, area=None, special_flags: int = 0):
+        src = pygame.Rect(area) if area is not None else source.get_rect()
+        dst = pygame.Rect(dest[0], dest[1], src.w, src.h)
+        self._copy(source, dst, src, special_flags)
+        return dst
+
+    def blit_scaled(self, source: pygame.Surface, rect: pygame.Rect, alpha: Optional[int] = None):
+        dst = pygame.Rect(rect)
+        dst, src = self._clipped(dst, source.get_rect())
+        if dst is None:
+            return
+        tex = self.texture(source)
+        if alpha is not None:
+            tex.alpha = alpha
+        tex.blend_mode = 1
+        tex.draw(srcrect=src, dstrect=dst)
+
+    def fill_rect(self, color: Color, rect: pygame.Rect, special_flags: int = 0):
+        rect = pygame.Rect(rect)
+        if self.clip is not None:
+            rect = rect.clip(self.clip)
+        if self.divisor > 1:
+            rect = _down(rect, self.divisor)
+        if not rect.w or not rect.h:
+            return
+        additive = special_flags in (pygame.BLEND_ADD, pygame.BLEND_RGBA_ADD)
+        self.renderer.draw_blend_mode = 2 if additive else 1
+        self.renderer.draw_color = (*color[:3], _alpha_of(color))
+        self.renderer.fill_rect(rect)
+
+    def draw_rect(self, color: Color, rect: pygame.Rect, width: int = 0, border_radius: int = -1):
+        # border_radius is ignored; SDL's renderer only draws square corners
+        rect = pygame.Rect(rect)
+        if width <= 0:
+            self.fill_rect(color, rect)
+            return
+        self.renderer.draw_blend_mode = 1
+        self.renderer.draw_color = (*color[:3], _alpha_of(color))
+        for i in range(max(1, width // self.divisor)):
+            edge = rect.inflate(-2 * i * self.divisor, -2 * i * self.divisor)
+            if self.clip is not None:
+                edge = edge.clip(self.clip)
+            if self.divisor > 1:
+                edge = _down(edge, self.divisor)
+            if edge.w > 0 and edge.h > 0:
+                self.renderer.draw_rect(edge)
+
+
+def _rect_with(size: Tuple[int, int], kwargs) -> pygame.Rect:
+    rect = pygame.Rect((0, 0), size)
+    for name, value in kwargs.items():
+        setattr(rect, name, value)
+    return rect
+
+
+def create_canvas(size: Tuple[int, int], title: str, backend: str = "surface", software: bool = False,
+                  divisor: int = 1):
+    # "surface" opens the usual display mode; "texture" opens an SDL window
+    # with a renderer (software=True forces SDL's software renderer).
+    # divisor > 1 renders at size // divisor and scales up on present.
+    if backend == "texture":
+        return TextureCanvas(size, title, software=software, divisor=divisor)
+    surface = pygame.display.set_mode(size)
+    pygame.display.set_caption(title)
+    return as_canvas(surface, divisor)
+
+
+def as_canvas(screen, divisor: int = 1):
+    # Accepts a canvas or a plain display Surface.
+    if not isinstance(screen, pygame.Surface):
+        return screen
+    return ScaledSurfaceCanvas(screen, divisor) if divisor > 1 else SurfaceCanvas(screen)
@@ -0,0 +1,133 @@
+from typing import List, Optional
+
+import pygame
+
+from quality import QualityGovernor
+from render import as_canvas
+
+
+# --- Scene base ---
+class Scene:
+    # A transparent scene lets the scene below it draw first (e.g. pause).
+    transparent = False
+
+    def __init__(self):
+        self.manager: Optional["SceneManager"] = None
+
+    # lifecycle hooks
+    def enter(self):
+        pass
+
+    def exit(self):
+        pass
+
+    def suspend(self):
+        pass
+
+    def resume(self):
+        pass
+
+    # per-frame hooks
+    def handle_event(self, event: pygame.event.Event):
+        pass
+
+    def update(self, dt: float):
+        pass
+
+    def draw(self, surface):
+        # surface is a render canvas (see render.py)
+        pass
+
+
+# --- Scene stack sharing one display and one clock ---
+class SceneManager:
+    # Scenes that are covered by another scene are suspended, not torn down,
+    # and popped scenes keep whatever they loaded, so pushing them again is
+    # cheap. Images are shared through the process-wide cache in assets.py.
+
+    def __init__(self, screen, clock: pygame.time.Clock, fps: int, allocations=None):
+        # accepts the display Surface or a canvas from render.create_canvas;
+        # allocations is an optional installed allocations.AllocationTracer
+        self.screen = as_canvas(screen)
+        self.clock = clock
+        self.fps = fps
+        self.stack: List[Scene] = []
+        self.running = False
+        # scenes scale their effects with self.quality.get(...)
+        self.quality = QualityGovernor(fps)
+        self.allocations = allocations
+
+    @property
+    def top(self) -> Optional[Scene]:
+        return self.stack[-1] if self.stack else None
+
+    def push(self, scene: Scene):
+        if self.stack:
+            self.stack[-1].suspend()
+        scene.manager = self
+        self.stack.append(scene)
+        if self.allocations is not None:
+            self.allocations.exempt()
+        scene.enter()
+
+    def pop(self) -> Optional[Scene]:
+        if not self.stack:
+            return None
+        scene = self.stack.pop()
+        scene.exit()
+        if self.stack:
+            self.stack[-1].resume()
+        return scene
+
+    def pop_to(self, scene: Scene):
+        # Pops every scene above scene, leaving it on top.
+        while self.stack and self.stack[-1] is not scene:
+            self.pop()
+
+    def switch(self, scene: Scene):
+        # Replaces the top scene without resuming the one below it.
+        if self.stack:
+            self.stack.pop().exit()
+        scene.manager = self
+        self.stack.append(scene)
+        if self.allocations is not None:
+            self.allocations.exempt()
+        scene.enter()
+
+    def quit(self):
+        self.running = False
+
+    def draw(self):
+        first = len(self.stack) - 1
+        while first > 0 and self.stack[first].transparent:
+            first -= 1
+        for scene in self.stack[first:]:
+            scene.draw(self.screen)
+
+    def run(self):
+        self.running = True
+        while self.running and self.stack:
+            dt = self.clock.tick(self.fps) / 1000.0
+            self.quality.record(self.clock.get_rawtime() / 1000.0)
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.quit()
+                    break
+                self.stack[-1].handle_event(event)
+            if not self.running or not self.stack:
+                break
+            scene = self.stack[-1]
+            scene.update(dt)
+            if not self.stack:
+                break
+            if self.stack[-1] is not scene:
+                # a scene was pushed or popped during update; let the new
+                # top scene update once before it is drawn
+                continue
+            self.screen.begin()
+            self.draw()
+            self.screen.present()
+            if self.allocations is not None:
+                self.allocations.end_frame()
+        while self.stack:
+            self.stack.pop().exit()